@@ -1,13 +1,26 @@
 """Request handlers for webhooks and reconciliation."""
 
+import asyncio
+import secrets
+from collections import defaultdict
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import orjson
 from google.cloud import pubsub_v1
 
-from app.notion_client import NotionClient
 from app.logging_setup import get_logger
-from app.models import PubSubMessage, SyncAction, SyncStatus, TaskSyncState, TodoistTask, TodoistWebhookEvent
+from app.mapper import map_task_to_todo
+from app.models import (
+    PubSubMessage,
+    SyncAction,
+    SyncStatus,
+    TaskSyncState,
+    TodoistTask,
+    TodoistWebhookEvent,
+)
+from app.notion_client import NotionClient
 from app.pubsub_worker import SyncWorker
 from app.reverse_mapper import (
     compute_notion_properties_hash,
@@ -17,7 +30,12 @@ from app.reverse_mapper import (
 from app.settings import settings
 from app.store import FirestoreStore
 from app.todoist_client import TodoistClient
-from app.utils import build_todoist_task_url, compute_payload_hash, has_capsync_label, should_auto_label_task
+from app.utils import (
+    build_todoist_task_url,
+    error_text,
+    has_capsync_label,
+    should_auto_label_task,
+)
 
 logger = get_logger(__name__)
 
@@ -34,6 +52,68 @@ class WebhookHandler:
         """
         self.publisher = pubsub_publisher
         self.topic_path = self.publisher.topic_path(settings.gcp_project_id, settings.pubsub_topic)
+        # (serialized message, future resolved once Pub/Sub has acknowledged it)
+        self._queue: Optional[asyncio.Queue[Optional[Tuple[bytes, asyncio.Future[None]]]]] = None
+        self._drain_task: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        """
+        Start the background publisher that drains queued webhook messages.
+
+        Until this is called (or after close()), messages are published
+        directly from handle_event().
+        """
+        if self._drain_task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=settings.webhook_publish_queue_size)
+        self._drain_task = asyncio.create_task(self._drain_queue())
+
+    async def close(self) -> None:
+        """Publish anything still queued and stop the background publisher."""
+        if self._drain_task is None or self._queue is None:
+            return
+        # Detach the queue first so events arriving during shutdown publish directly
+        queue, self._queue = self._queue, None
+        await queue.put(None)
+        await self._drain_task
+        self._drain_task = None
+
+    async def _drain_queue(self) -> None:
+        """
+        Publish queued messages in batches until the shutdown sentinel is seen.
+
+        Each batch's publish futures are awaited (without blocking the event
+        loop) before the next batch is taken, so the client's batching
+        coalesces bursts into few gRPC calls, the queue provides backpressure,
+        and close() returns only once everything queued has been acknowledged.
+        Every queued message's waiter is resolved with the publish outcome, so
+        the webhook is only acknowledged once Pub/Sub has accepted the message.
+        """
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < settings.pubsub_batch_max_messages:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            items = [item for item in batch if item is not None]
+            results = await asyncio.gather(
+                *(self._publish_and_wait(data) for data, _ in items),
+                return_exceptions=True,
+            )
+            for (_, waiter), result in zip(items, results):
+                if waiter.done():
+                    continue
+                if isinstance(result, BaseException):
+                    waiter.set_exception(result)
+                else:
+                    waiter.set_result(None)
+
+            if None in batch:
+                return
 
     async def handle_event(self, event: TodoistWebhookEvent) -> Dict[str, str]:
         """
@@ -76,8 +156,9 @@ class WebhookHandler:
             snapshot=event.event_data,  # Include snapshot to avoid immediate re-fetch
         )
 
-        # Publish to Pub/Sub
-        self._publish_message(message)
+        # Hand off to the background publisher (or publish directly if it isn't running)
+        # and wait for Pub/Sub to accept it, so a failure surfaces to Todoist for a retry
+        await self._publish_message(message)
 
         logger.info(
             "Published sync job to Pub/Sub",
@@ -115,21 +196,80 @@ class WebhookHandler:
         # Ignore other events
         return None
 
-    def _publish_message(self, message: PubSubMessage) -> None:
+    async def _publish_message(self, message: PubSubMessage) -> None:
         """
-        Publish message to Pub/Sub.
+        Publish a message to Pub/Sub and wait for the server to acknowledge it.
+
+        When the background publisher is running the serialized message is
+        put on its queue (waiting only if the queue is full) and batched with
+        other webhooks; otherwise it is published directly.
 
         Args:
             message: PubSubMessage to publish
-        """
-        import orjson
 
+        Raises:
+            Exception: If Pub/Sub did not accept the message
+        """
         data = orjson.dumps(message.model_dump())
-        future = self.publisher.publish(self.topic_path, data)
+        if self._queue is not None:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            await self._queue.put((data, waiter))
+            await waiter
+        else:
+            await self._publish_and_wait(data)
+
+    async def _publish_and_wait(self, data: bytes) -> None:
+        """
+        Publish serialized message bytes and wait for the server ack.
+
+        Args:
+            data: JSON-encoded PubSubMessage
+
+        Raises:
+            RuntimeError: If the message could not be handed to the client
+            Exception: The publish future's error if Pub/Sub rejected it
+        """
+        future = self._publish_data(data)
+        if future is None:
+            raise RuntimeError("Failed to publish message to Pub/Sub")
+        await asyncio.wrap_future(future)
+
+    def _publish_data(self, data: bytes) -> Optional[Future]:
+        """
+        Publish serialized message bytes without waiting for the server ack.
+
+        The publisher batches messages in the background; the outcome is
+        logged by a done-callback so callers aren't held up.
+
+        Args:
+            data: JSON-encoded PubSubMessage
+
+        Returns:
+            The publish future, or None if the message could not be handed to the client
+        """
+        try:
+            future = self.publisher.publish(self.topic_path, data)
+        except Exception:
+            logger.error("Failed to publish message to Pub/Sub", exc_info=True)
+            return None
+        future.add_done_callback(_log_publish_result)
+        return future
+
+
+def _log_publish_result(future: Future) -> None:
+    """
+    Log the outcome of an asynchronous Pub/Sub publish.
 
-        # We could await the future, but for webhook responses we want to be fast
-        # The future will complete asynchronously
-        logger.debug("Published message to Pub/Sub", extra={"message_id": future.result()})
+    Args:
+        future: Publish future returned by PublisherClient.publish
+    """
+    try:
+        message_id = future.result()
+    except Exception:
+        logger.error("Failed to publish message to Pub/Sub", exc_info=True)
+        return
+
+    logger.debug("Published message to Pub/Sub", extra={"message_id": message_id})
 
 
 class ReconcileHandler:
@@ -153,6 +293,89 @@ class ReconcileHandler:
         self.notion = notion_client
         self.store = store
         self.worker = SyncWorker(todoist_client, notion_client, store)
+        self._run_lock = asyncio.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a background reconciliation is currently in progress."""
+        return self._run_lock.locked()
+
+    async def start_run(self) -> Optional[str]:
+        """
+        Claim a new reconciliation run.
+
+        Creates a "running" record in the store and marks the run as in
+        progress in a Firestore transaction, so Cloud Scheduler retries or
+        other instances can't start an overlapping run.
+
+        Returns:
+            The new run ID, or None if a reconciliation is already in progress
+        """
+        if self.is_running:
+            return None
+
+        run_id = secrets.token_hex(8)
+        started_at = datetime.now(timezone.utc).isoformat()
+        if not await self.store.claim_reconcile_run(
+            run_id, started_at, stale_after=settings.reconcile_claim_ttl
+        ):
+            return None
+
+        return run_id
+
+    async def run_in_background(self, run_id: Optional[str] = None) -> None:
+        """
+        Run a reconciliation and record its outcome in the store.
+
+        Intended to be scheduled as a FastAPI background task. Runs are
+        serialized: if a reconciliation is already in progress this call
+        returns immediately instead of starting a second, overlapping run.
+
+        Args:
+            run_id: Run claimed with start_run(); its record is updated with the
+                summary and its in-progress claim released when the run ends
+        """
+        if self._run_lock.locked():
+            logger.info("Reconciliation already running, skipping")
+            if run_id:
+                await self.store.save_reconcile_run(run_id, {"status": "skipped"})
+                await self.store.release_reconcile_run(run_id)
+            return
+
+        async with self._run_lock:
+            started_at = datetime.now(timezone.utc)
+            try:
+                summary = await self.reconcile()
+            except Exception as e:
+                logger.error("Error during background reconciliation", exc_info=True)
+                summary = {
+                    "status": "error",
+                    "error": error_text(e),
+                    "error_type": e.__class__.__name__,
+                }
+
+            finished_at = datetime.now(timezone.utc)
+            summary["run_id"] = run_id
+            summary["started_at"] = started_at.isoformat()
+            summary["finished_at"] = finished_at.isoformat()
+            summary["duration_seconds"] = round((finished_at - started_at).total_seconds(), 2)
+
+            try:
+                await self.store.set_last_reconcile_summary(summary)
+                if run_id:
+                    await self.store.save_reconcile_run(run_id, summary)
+            except Exception:
+                logger.error("Failed to record reconciliation summary", exc_info=True)
+            finally:
+                if run_id:
+                    try:
+                        await self.store.release_reconcile_run(run_id)
+                    except Exception:
+                        logger.error(
+                            "Failed to release reconcile claim",
+                            extra={"run_id": run_id},
+                            exc_info=True,
+                        )
 
     async def _auto_label_tasks(self) -> int:
         """
@@ -252,6 +475,83 @@ class ReconcileHandler:
         
         return auto_labeled + auto_unlabeled
 
+    async def _upsert_tasks(
+        self, tasks: List[TodoistTask], semaphore: asyncio.Semaphore
+    ) -> int:
+        """
+        Sync tasks to Notion concurrently, one chain of tasks per project.
+
+        Tasks sharing a project run in order, so a project's page is looked up
+        (and created if missing) by one task before the next uses it; different
+        projects run in parallel up to the semaphore's limit.
+
+        Args:
+            tasks: Tasks to upsert
+            semaphore: Bounds how many tasks sync at once
+
+        Returns:
+            Number of tasks upserted
+        """
+        tasks_by_project: Dict[str, List[TodoistTask]] = defaultdict(list)
+        for task in tasks:
+            tasks_by_project[task.project_id].append(task)
+
+        async def _upsert_project_tasks(project_tasks: List[TodoistTask]) -> int:
+            upserted = 0
+            for task in project_tasks:
+                try:
+                    # Pass the task snapshot to avoid re-fetching each task individually;
+                    # it already has full data from the bulk fetch
+                    message = PubSubMessage(
+                        action=SyncAction.UPSERT,
+                        todoist_task_id=task.id,
+                        snapshot=task.model_dump(),
+                    )
+                    async with semaphore:
+                        await self.worker.process_message(message, sync_source="reconciliation")
+                    upserted += 1
+                except Exception as e:
+                    logger.error(
+                        "Error upserting task during reconcile",
+                        extra={"task_id": task.id, "error": str(e)},
+                    )
+            return upserted
+
+        counts = await asyncio.gather(
+            *(_upsert_project_tasks(project_tasks) for project_tasks in tasks_by_project.values())
+        )
+        return sum(counts)
+
+    async def _archive_tasks(self, task_ids: Iterable[str], semaphore: asyncio.Semaphore) -> int:
+        """
+        Archive tasks in Notion concurrently.
+
+        Args:
+            task_ids: Todoist IDs of tasks to archive
+            semaphore: Bounds how many tasks are archived at once
+
+        Returns:
+            Number of tasks archived
+        """
+        async def _archive(task_id: str) -> bool:
+            try:
+                message = PubSubMessage(
+                    action=SyncAction.ARCHIVE,
+                    todoist_task_id=task_id,
+                )
+                async with semaphore:
+                    await self.worker.process_message(message)
+                return True
+            except Exception as e:
+                logger.error(
+                    "Error archiving task during reconcile",
+                    extra={"task_id": task_id, "error": str(e)},
+                )
+                return False
+
+        results = await asyncio.gather(*(_archive(task_id) for task_id in task_ids))
+        return sum(results)
+
     async def reconcile(self) -> Dict[str, Any]:
         """
         Perform full reconciliation of all @capsync tasks.
@@ -293,7 +593,9 @@ class ReconcileHandler:
                 "/tasks",
                 params={"filter": "@capsync & is:completed"}
             )
-            completed_tasks = [TodoistTask(**task) for task in completed_tasks_response]
+            completed_tasks = [
+                TodoistTask.model_validate(task) for task in completed_tasks_response
+            ]
         except Exception as e:
             logger.warning(
                 "Could not fetch completed tasks, continuing with active tasks only",
@@ -319,24 +621,9 @@ class ReconcileHandler:
         stored_states = await self.store.get_all_task_states()
         stored_task_ids = {state.todoist_task_id for state in stored_states}
 
-        # OPTIMIZATION: Pass task snapshots to avoid re-fetching each task individually.
-        # Each task already has full data from the bulk fetch above.
-        # This saves ~262 GET /tasks/{id} calls (1 per task).
-        upserted = 0
-        for task in all_fetched_tasks:
-            try:
-                message = PubSubMessage(
-                    action=SyncAction.UPSERT,
-                    todoist_task_id=task.id,
-                    snapshot=task.model_dump(),
-                )
-                await self.worker.process_message(message, sync_source="reconciliation")
-                upserted += 1
-            except Exception as e:
-                logger.error(
-                    "Error upserting task during reconcile",
-                    extra={"task_id": task.id, "error": str(e)},
-                )
+        # Sync tasks concurrently, bounded by settings.reconcile_concurrency
+        semaphore = asyncio.Semaphore(settings.reconcile_concurrency)
+        upserted = await self._upsert_tasks(all_fetched_tasks, semaphore)
 
         # Note: Completed tasks are already included in all_fetched_tasks above
         # (fetched via the "@capsync & is:completed" filter in lines 276-280)
@@ -344,21 +631,7 @@ class ReconcileHandler:
 
         # Find tasks that need archiving (in store but not in active tasks)
         tasks_to_archive = stored_task_ids - active_task_ids
-        archived = 0
-
-        for task_id in tasks_to_archive:
-            try:
-                message = PubSubMessage(
-                    action=SyncAction.ARCHIVE,
-                    todoist_task_id=task_id,
-                )
-                await self.worker.process_message(message)
-                archived += 1
-            except Exception as e:
-                logger.error(
-                    "Error archiving task during reconcile",
-                    extra={"task_id": task_id, "error": str(e)},
-                )
+        archived = await self._archive_tasks(tasks_to_archive, semaphore)
 
         summary = {
             "status": "completed",
@@ -404,7 +677,7 @@ class ReconcileHandler:
                         logger.info("Un-archived Notion project", extra={"project_id": project.id})
 
             except Exception as e:
-                logger.warning(f"Failed to update project status for {project.id}: {e}")
+                logger.warning("Failed to update project status for %s: %s", project.id, e)
 
         # Also sync project names from Notion → Todoist
         await self._reconcile_notion_project_names()
@@ -546,12 +819,11 @@ class ReconcileHandler:
                 # 1. notion_payload_hash = current Notion state (prevents re-pushing same changes)
                 # 2. payload_hash = re-computed from the Todoist task (prevents the resulting
                 #    Todoist→Notion push from creating an echo)
-                from app.mapper import map_task_to_todo
                 updated_task = await self.todoist.get_task(todoist_task_id)
                 project = await self.todoist.get_project(updated_task.project_id)
                 comments = await self.todoist.get_comments(todoist_task_id)
                 todo = map_task_to_todo(updated_task, project, comments)
-                new_payload_hash = compute_payload_hash(todo.model_dump())
+                new_payload_hash = todo.payload_hash()
 
                 state.payload_hash = new_payload_hash
                 state.notion_payload_hash = current_hash
@@ -673,11 +945,10 @@ class ReconcileHandler:
                 # Compute hashes for echo suppression
                 notion_hash = compute_notion_properties_hash(notion_props)
 
-                from app.mapper import map_task_to_todo
                 project = await self.todoist.get_project(todoist_project_id)
                 comments = await self.todoist.get_comments(new_task.id)
                 todo = map_task_to_todo(new_task, project, comments)
-                payload_hash = compute_payload_hash(todo.model_dump())
+                payload_hash = todo.payload_hash()
 
                 # Create Firestore state
                 new_state = TaskSyncState(
@@ -703,7 +974,7 @@ class ReconcileHandler:
 
         logger.info(
             "Notion task creation complete",
-            extra={"created": created_count},
+            extra={"created_count": created_count},
         )
 
         return created_count
@@ -737,10 +1008,10 @@ class ReconcileHandler:
                             await self.todoist.update_project_name(proj_id, name)
                             logger.info(
                                 "Updated Todoist project name from Notion",
-                                extra={"project_id": proj_id, "name": name},
+                                extra={"project_id": proj_id, "project_name": name},
                             )
                     except Exception as e:
-                        logger.debug(f"Could not sync project {proj_id}: {e}")
+                        logger.debug("Could not sync project %s: %s", proj_id, e)
 
         except Exception as e:
             logger.warning(
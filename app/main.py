@@ -1,24 +1,102 @@
 """FastAPI application entry point."""
 
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import logging
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict
-
-from fastapi import FastAPI, Header, HTTPException, Request, status
-from fastapi.responses import ORJSONResponse
-from google.cloud import pubsub_v1
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter
+from typing import Any, AsyncGenerator, Coroutine, Dict, List, Optional, Set
+
+import httpx
+import orjson
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response
+from google.cloud import firestore, pubsub_v1
+from pydantic import TypeAdapter, ValidationError
 
 from app.handlers import ReconcileHandler, WebhookHandler
 from app.logging_setup import get_logger, setup_logging
-from app.models import TodoistWebhookEvent
+from app.mapper import map_project_to_notion, map_task_to_todo
+from app.migration import run_v1_id_migration
+from app.models import PubSubMessage, TodoistWebhookEvent
 from app.notion_client import NotionClient
+from app.oidc import GoogleCertCache, verify_oidc_token
+from app.pubsub_worker import SyncWorker
 from app.settings import settings
 from app.store import FirestoreStore
 from app.todoist_client import TodoistClient
+from app.utils import error_text, has_capsync_label
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
+# Field projections for the /test/todoist summaries (built once, reused per request)
+_PROJECT_SUMMARY_FIELDS = ("id", "name")
+_TASK_SUMMARY_FIELDS = ("id", "content", "labels", "project_id")
+_project_summary_values = attrgetter(*_PROJECT_SUMMARY_FIELDS)
+_task_summary_values = attrgetter(*_TASK_SUMMARY_FIELDS)
+
+# How many projects/tasks /test/todoist lists
+_TEST_PROJECT_LIMIT = 5
+_TEST_TASK_LIMIT = 20
+
+# Keyed HMAC-SHA256 state for webhook verification (None when no secret is configured);
+# copied per request instead of re-keying. Passing the OpenSSL-backed hashlib.sha256
+# constructor keeps hmac on OpenSSL's native HMAC, which picks SHA-NI itself when available.
+_WEBHOOK_HMAC_TEMPLATE = (
+    hmac.new(settings.todoist_client_secret.encode("utf-8"), b"", hashlib.sha256)
+    if settings.todoist_client_secret
+    else None
+)
+# Length of a base64-encoded SHA-256 digest (32 bytes)
+_WEBHOOK_SIGNATURE_B64_LEN = 44
+
+# Decoders used on every Pub/Sub push, bound once to skip per-call module attribute lookups
+_b64decode = base64.b64decode
+_orjson_loads = orjson.loads
+
+# JSON validators for inbound payloads, built once and shared by the handlers
+_PUBSUB_VALIDATOR = TypeAdapter(PubSubMessage).validate_json
+_WEBHOOK_VALIDATOR = TypeAdapter(TodoistWebhookEvent).validate_json
+
+# Expected Authorization header for the internal cron token (settings are fixed at startup),
+# kept as bytes for constant-time comparison; None disables it when no token is configured
+_CRON_AUTH_HEADER = (
+    f"Bearer {settings.internal_cron_token}".encode()
+    if settings.internal_cron_token
+    else None
+)
+_OIDC_AUTH_PREFIX = "Bearer eyJ"
+
+# Constant JSON bodies, serialized once at import and returned as raw bytes
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+_LOCAL_DEV_WEBHOOK_BODY = orjson.dumps(
+    {
+        "status": "received_local_dev",
+        "message": (
+            "Running in local dev mode without Pub/Sub. Deploy to GCP for full functionality."
+        ),
+    }
+)
+_LOCAL_DEV_PUBSUB_BODY = orjson.dumps(
+    {
+        "status": "local_dev_mode",
+        "message": "Running in local dev mode without Firestore.",
+    }
+)
+_LOCAL_DEV_RECONCILE_BODY = orjson.dumps(
+    {
+        "status": "local_dev_mode",
+        "message": "Running in local dev mode without Firestore. Deploy to GCP for reconciliation.",
+    }
+)
+
 
 # Application state
 class AppState:
@@ -41,40 +119,92 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     logger.info("Starting application")
 
+    # Fire-and-forget work (e.g. verbose logging) kept referenced until done
+    app.state.background_tasks = set()
+
     # Initialize clients
     app.state.todoist_client = TodoistClient()
     app.state.notion_client = NotionClient()
     
     # Initialize GCP clients (optional for local dev)
     try:
-        app.state.store = FirestoreStore()
-        app.state.pubsub_publisher = pubsub_v1.PublisherClient()
+        # One AsyncClient (and gRPC channel) shared by every collection; created
+        # eagerly so credential lookup happens at startup, not on the first request
+        app.state.firestore_client = firestore.AsyncClient(project=settings.gcp_project_id)
+        app.state.store = FirestoreStore(client=app.state.firestore_client)
+        app.state.pubsub_publisher = pubsub_v1.PublisherClient(
+            batch_settings=pubsub_v1.types.BatchSettings(
+                max_messages=settings.pubsub_batch_max_messages,
+                max_bytes=settings.pubsub_batch_max_bytes,
+                max_latency=settings.pubsub_batch_max_latency,
+            ),
+        )
         logger.info("GCP clients initialized successfully")
     except Exception as e:
-        logger.warning(f"GCP clients not available (running in local dev mode): {e}")
+        logger.warning("GCP clients not available (running in local dev mode): %s", e)
+        app.state.firestore_client = None
         app.state.store = None
         app.state.pubsub_publisher = None
 
     # Initialize handlers
     if app.state.pubsub_publisher:
         app.state.webhook_handler = WebhookHandler(app.state.pubsub_publisher)
+        await app.state.webhook_handler.start()
     else:
         app.state.webhook_handler = None
-        
+
+    # Fixed for the lifetime of the process; read by routes instead of re-deriving per request
+    app.state.prod_mode = app.state.store is not None and app.state.pubsub_publisher is not None
+
     app.state.reconcile_handler = ReconcileHandler(
         app.state.todoist_client,
         app.state.notion_client,
         app.state.store,
     )
 
+    # Google signing certificates for Cloud Scheduler OIDC tokens, shared across requests
+    app.state.oidc_cert_cache = GoogleCertCache()
+    if app.state.prod_mode:
+        missing = [
+            name
+            for name, value in (
+                ("OIDC_AUDIENCE", settings.oidc_audience),
+                ("OIDC_SERVICE_ACCOUNT_EMAIL", settings.oidc_service_account_email),
+            )
+            if not value
+        ]
+        if missing:
+            logger.error(
+                "OIDC settings not configured; Cloud Scheduler reconcile calls with "
+                "OIDC tokens will be rejected",
+                extra={"missing": missing},
+            )
+
     logger.info("Application started successfully")
 
     yield
 
     # Cleanup
     logger.info("Shutting down application")
+    if app.state.background_tasks:
+        await asyncio.gather(*app.state.background_tasks, return_exceptions=True)
+    if app.state.webhook_handler:
+        await app.state.webhook_handler.close()
     if app.state.store:
         await app.state.store.close()
+    await app.state.oidc_cert_cache.close()
+
+
+# orjson options for every JSON response, assembled once instead of per render
+_ORJSON_RESPONSE_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class FastORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson using module-level options."""
+
+    def render(self, content: Any) -> bytes:
+        """Serialize response content to JSON bytes."""
+        return orjson.dumps(content, option=_ORJSON_RESPONSE_OPTIONS)
 
 
 # Create FastAPI app
@@ -82,15 +212,198 @@ app = FastAPI(
     title="Todoist-Capacities Sync",
     description="Synchronize Todoist tasks to Capacities",
     version="1.0.0",
-    default_response_class=ORJSONResponse,
+    default_response_class=FastORJSONResponse,
     lifespan=lifespan,
 )
 
 
-@app.get("/health")
-async def health_check() -> Dict[str, str]:
+# Dependency providers for the long-lived clients created in lifespan
+async def get_todoist_client(request: Request) -> TodoistClient:
+    """Provide the shared Todoist client."""
+    return request.app.state.todoist_client
+
+
+async def get_notion_client(request: Request) -> NotionClient:
+    """Provide the shared Notion client."""
+    return request.app.state.notion_client
+
+
+async def get_store(request: Request) -> Optional[FirestoreStore]:
+    """Provide the shared Firestore store (None in local dev mode)."""
+    return request.app.state.store
+
+
+async def get_pubsub_publisher(request: Request) -> Optional[pubsub_v1.PublisherClient]:
+    """Provide the shared Pub/Sub publisher (None in local dev mode)."""
+    return request.app.state.pubsub_publisher
+
+
+async def get_webhook_handler(request: Request) -> Optional[WebhookHandler]:
+    """Provide the webhook handler (None in local dev mode)."""
+    return request.app.state.webhook_handler
+
+
+async def get_reconcile_handler(request: Request) -> ReconcileHandler:
+    """Provide the reconcile handler."""
+    return request.app.state.reconcile_handler
+
+
+async def get_oidc_cert_cache(request: Request) -> GoogleCertCache:
+    """Provide the shared Google OIDC certificate cache."""
+    return request.app.state.oidc_cert_cache
+
+
+async def get_background_tasks(request: Request) -> Set["asyncio.Task[Any]"]:
+    """Provide the set tracking in-flight fire-and-forget tasks."""
+    return request.app.state.background_tasks
+
+
+async def get_prod_mode(request: Request) -> bool:
+    """Provide whether all GCP clients were initialized at startup."""
+    return request.app.state.prod_mode
+
+
+# Health probes get the same prebuilt response every time; the route has no background
+# tasks, so FastAPI never mutates it
+_HEALTH_RESPONSE = Response(
+    content=_HEALTH_BODY,
+    media_type="application/json",
+    headers={"cache-control": "no-store"},
+)
+
+
+@app.get("/health", response_model=None)
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return _HEALTH_RESPONSE
+
+
+def _json_bytes_response(content: bytes) -> Response:
+    """
+    Wrap pre-serialized JSON bytes in a response without re-encoding.
+
+    Args:
+        content: JSON-encoded body
+
+    Returns:
+        Response with an application/json media type
+    """
+    return Response(content=content, media_type="application/json")
+
+
+def _orjson_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize a route result with orjson and wrap it in a ready-made response.
+
+    Returning a Response skips FastAPI's jsonable_encoder pass, which otherwise
+    walks every returned dict before FastORJSONResponse renders it. It also
+    bypasses the route's status_code, so routes that declare one pass it here.
+
+    Args:
+        content: JSON-serializable result (dicts, lists, strings, numbers, datetimes)
+        status_code: HTTP status of the response
+
+    Returns:
+        Response with an application/json media type
+    """
+    return Response(
+        content=orjson.dumps(content, option=_ORJSON_RESPONSE_OPTIONS),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _spawn(tasks: Set["asyncio.Task[Any]"], coro: Coroutine[Any, Any, Any]) -> None:
+    """
+    Run a coroutine in the background without awaiting it.
+
+    The task is held in ``tasks`` until it finishes so it isn't garbage
+    collected mid-flight, and so shutdown can wait for it.
+
+    Args:
+        tasks: Set of in-flight background tasks
+        coro: Coroutine to run
+    """
+    task = asyncio.ensure_future(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+
+
+def _log_pubsub_message(message: PubSubMessage) -> None:
+    """Emit the verbose 'Received Pub/Sub message' log (runs in a worker thread)."""
+    logger.info(
+        "Received Pub/Sub message",
+        extra={"pubsub_message": message.model_dump(mode="json")},
+    )
+
+
+async def _none() -> None:
+    """Placeholder awaitable for optional slots in asyncio.gather()."""
+    return None
+
+
+def _validation_errors(e: ValidationError) -> List[Dict[str, Any]]:
+    """
+    Summarize a validation error for an API response.
+
+    The offending input is dropped: it may be raw bytes (not JSON
+    serializable) and would echo the whole payload back.
+
+    Args:
+        e: Pydantic validation error
+
+    Returns:
+        List of error dicts with type, location and message
+    """
+    return [
+        {"type": err["type"], "loc": err["loc"], "msg": err["msg"]}
+        for err in e.errors(include_url=False, include_context=False)
+    ]
+
+
+def _declared_length(request: Request) -> int:
+    """
+    Get the request's declared Content-Length.
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        Declared body size in bytes, or 0 if missing or malformed
+    """
+    try:
+        return int(request.headers.get("content-length", "0"))
+    except ValueError:
+        return 0
+
+
+async def _read_body(request: Request, max_bytes: int) -> Optional[bytes]:
+    """
+    Read the request body, giving up as soon as it exceeds ``max_bytes``.
+
+    A declared Content-Length over the limit is rejected before anything is
+    read. Because the header may be missing or understated, the limit is also
+    enforced on the bytes actually streamed, so an oversized body is never
+    buffered in full.
+
+    Args:
+        request: FastAPI request object
+        max_bytes: Largest accepted body size
+
+    Returns:
+        Body bytes, or None if the body is larger than ``max_bytes``
+    """
+    if _declared_length(request) > max_bytes:
+        return None
+
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 def _verify_webhook_signature(body: bytes, signature_header: str) -> bool:
@@ -104,11 +417,7 @@ def _verify_webhook_signature(body: bytes, signature_header: str) -> bool:
     Returns:
         True if signature is valid
     """
-    import base64
-    import hashlib
-    import hmac
-
-    if not settings.todoist_client_secret:
+    if _WEBHOOK_HMAC_TEMPLATE is None:
         # No client secret configured - skip verification (dev mode)
         logger.debug("Webhook HMAC verification skipped (no client secret configured)")
         return True
@@ -117,37 +426,70 @@ def _verify_webhook_signature(body: bytes, signature_header: str) -> bool:
         logger.warning("Webhook missing X-Todoist-Hmac-SHA256 header")
         return False
 
-    expected = base64.b64encode(
-        hmac.new(
-            settings.todoist_client_secret.encode("utf-8"),
-            body,
-            hashlib.sha256,
-        ).digest()
-    ).decode("utf-8")
+    # A malformed signature can never match; reject it before hashing the body
+    if len(signature_header) != _WEBHOOK_SIGNATURE_B64_LEN:
+        logger.warning(
+            "Webhook HMAC signature has unexpected length",
+            extra={"length": len(signature_header)},
+        )
+        return False
+
+    try:
+        provided = base64.b64decode(signature_header, validate=True)
+    except binascii.Error:
+        logger.warning("Webhook HMAC signature is not valid base64")
+        return False
+
+    # Copying the keyed template skips re-deriving the inner/outer pads per request
+    mac = _WEBHOOK_HMAC_TEMPLATE.copy()
+    mac.update(body)
 
-    is_valid = hmac.compare_digest(expected, signature_header)
+    is_valid = hmac.compare_digest(mac.digest(), provided)
     if not is_valid:
         logger.warning("Webhook HMAC signature mismatch")
 
     return is_valid
 
 
-@app.post("/todoist/webhook")
-async def todoist_webhook(request: Request) -> Dict[str, Any]:
+@app.post("/todoist/webhook", response_model=None)
+async def todoist_webhook(
+    request: Request,
+    webhook_handler: Optional[WebhookHandler] = Depends(get_webhook_handler),
+) -> Response:
     """
     Receive Todoist webhook events with HMAC signature verification.
 
+    The raw body is read exactly once and the same bytes are used for both
+    the HMAC check and JSON parsing; nothing here calls ``request.json()``.
+    Middleware in front of this route must not consume or rewrite the body,
+    or signature verification will fail.
+
     Args:
         request: FastAPI request object
+        webhook_handler: Webhook handler (None in local dev mode)
 
     Returns:
-        Response dictionary
+        Handler result as a JSON response
     """
-    # Read raw body for HMAC verification
-    body = await request.body()
+    # Reject unsigned requests before buffering the body when verification is enabled
+    signature = request.headers.get("X-Todoist-Hmac-SHA256", "")
+    if not signature and _WEBHOOK_HMAC_TEMPLATE is not None:
+        logger.warning("Missing webhook signature header")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing webhook signature",
+        )
+
+    # Read raw body once, stopping early if it is oversized; shared by HMAC
+    # verification and payload parsing
+    body = await _read_body(request, settings.webhook_max_body_bytes)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Webhook payload too large",
+        )
 
     # Verify HMAC signature
-    signature = request.headers.get("X-Todoist-Hmac-SHA256", "")
     if not _verify_webhook_signature(body, signature):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -155,37 +497,44 @@ async def todoist_webhook(request: Request) -> Dict[str, Any]:
         )
 
     # Check if running in local dev mode (no Pub/Sub)
-    if not request.app.state.webhook_handler:
+    if not webhook_handler:
         logger.info("Received webhook in local dev mode (Pub/Sub not available)")
-        import orjson
-        payload = orjson.loads(body)
-        return {
-            "status": "received_local_dev",
-            "message": "Running in local dev mode without Pub/Sub. Deploy to GCP for full functionality.",
-            "event": payload.get("event_name", "unknown"),
-        }
+        # Body is not parsed here; the static acknowledgement is serialized once at import
+        return _json_bytes_response(_LOCAL_DEV_WEBHOOK_BODY)
 
     try:
-        # Parse webhook payload from raw body
-        import orjson
-        payload = orjson.loads(body)
-        event = TodoistWebhookEvent(**payload)
+        # Parse and validate webhook payload straight from the raw body
+        event = _WEBHOOK_VALIDATOR(body)
 
-        # Handle event
-        result = await request.app.state.webhook_handler.handle_event(event)
+        # Handle event (the model is frozen, so passing it down never re-validates or copies it)
+        result = await webhook_handler.handle_event(event)
 
-        return result
+        return _orjson_response(result)
+
+    except ValidationError as e:
+        # Malformed payloads are expected; report them without a traceback
+        logger.warning("Invalid webhook payload", extra={"error_count": e.error_count()})
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_validation_errors(e),
+        )
 
     except Exception as e:
         logger.error("Error processing webhook", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing webhook: {str(e)}",
+            detail=f"Error processing webhook: {error_text(e)}",
         )
 
 
-@app.post("/pubsub/process")
-async def process_pubsub(request: Request) -> Dict[str, Any]:
+@app.post("/pubsub/process", response_model=None)
+async def process_pubsub(
+    request: Request,
+    todoist_client: TodoistClient = Depends(get_todoist_client),
+    notion_client: NotionClient = Depends(get_notion_client),
+    store: Optional[FirestoreStore] = Depends(get_store),
+    background_tasks: Set["asyncio.Task[Any]"] = Depends(get_background_tasks),
+) -> Response:
     """
     Process Pub/Sub push messages.
     
@@ -194,69 +543,92 @@ async def process_pubsub(request: Request) -> Dict[str, Any]:
     
     Args:
         request: FastAPI request object containing Pub/Sub message
+        todoist_client: Todoist API client
+        notion_client: Notion API client
+        store: Firestore store (None in local dev mode)
+        background_tasks: Set of in-flight background tasks
         
     Returns:
         Processing status
     """
     # Check if running in production with GCP clients
-    if not request.app.state.store:
-        return {
-            "status": "local_dev_mode",
-            "message": "Running in local dev mode without Firestore.",
-        }
+    if not store:
+        return _json_bytes_response(_LOCAL_DEV_PUBSUB_BODY)
+
+    # Oversized messages will never succeed; acknowledge (2xx) so Pub/Sub doesn't redeliver
+    raw_body = await _read_body(request, settings.pubsub_max_body_bytes)
+    if raw_body is None:
+        logger.warning(
+            "Rejecting oversized Pub/Sub message",
+            extra={
+                "content_length": _declared_length(request),
+                "limit": settings.pubsub_max_body_bytes,
+            },
+        )
+        return _orjson_response({
+            "status": "error",
+            "error": "payload_too_large",
+        })
     
     try:
-        import base64
-        import json
-        from app.pubsub_worker import SyncWorker
-        from app.models import PubSubMessage
-        
-        # Parse Pub/Sub message
-        body = await request.json()
+        # Parse Pub/Sub envelope with orjson (not Starlette's stdlib-backed request.json())
+        body = _orjson_loads(raw_body)
         if "message" not in body:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid Pub/Sub message format",
             )
         
-        # Decode message data
-        message_data = base64.b64decode(body["message"]["data"]).decode("utf-8")
-        message_json = json.loads(message_data)
-        
-        logger.info(
-            "Received Pub/Sub message",
-            extra={"message": message_json},
-        )
+        message = body["message"]
+        raw = _b64decode(message["data"])
+
+        # Decode message data and validate it straight from the JSON bytes. The
+        # endpoint is unauthenticated, so every message is treated as external input.
+        pubsub_message = _PUBSUB_VALIDATOR(raw)
         
-        # Parse into PubSubMessage model
-        pubsub_message = PubSubMessage(**message_json)
+        if logger.isEnabledFor(logging.INFO):
+            # Dumping and formatting the full snapshot is the costliest log line here;
+            # do it off the event loop (the message is frozen, so sharing it is safe)
+            _spawn(background_tasks, asyncio.to_thread(_log_pubsub_message, pubsub_message))
         
         # Create worker and process
         worker = SyncWorker(
-            todoist_client=request.app.state.todoist_client,
-            notion_client=request.app.state.notion_client,
-            store=request.app.state.store,
+            todoist_client=todoist_client,
+            notion_client=notion_client,
+            store=store,
         )
         
         await worker.process_message(pubsub_message)
         
-        return {
+        return _orjson_response({
             "status": "success",
             "task_id": pubsub_message.todoist_task_id,
             "action": pubsub_message.action,
-        }
+        })
         
+    except ValidationError as e:
+        # Malformed payloads are expected; report them without a traceback.
+        # Acknowledge (2xx) since redelivery can't fix an invalid message.
+        logger.warning("Invalid Pub/Sub message", extra={"error_count": e.error_count()})
+        return _orjson_response({
+            "status": "invalid",
+            "errors": _validation_errors(e),
+        })
+
     except Exception as e:
         logger.error("Error processing Pub/Sub message", exc_info=True)
         # Don't raise HTTPException - Pub/Sub will retry on failure
-        return {
+        return _orjson_response({
             "status": "error",
-            "error": str(e),
-        }
+            "error": error_text(e),
+        })
 
 
-@app.get("/test/reconcile")
-async def test_reconcile(request: Request) -> Dict[str, Any]:
+@app.get("/test/reconcile", response_model=None)
+async def test_reconcile(
+    store: Optional[FirestoreStore] = Depends(get_store),
+    reconcile_handler: ReconcileHandler = Depends(get_reconcile_handler),
+) -> Response:
     """
     Test reconcile endpoint that doesn't require authorization (for manual testing).
     
@@ -265,69 +637,68 @@ async def test_reconcile(request: Request) -> Dict[str, Any]:
     """
     try:
         # Check if running in local dev mode (no Firestore)
-        if not request.app.state.store:
-            return {
-                "status": "local_dev_mode",
-                "message": "Running in local dev mode without Firestore. Deploy to GCP for reconciliation.",
-            }
+        if not store:
+            return _json_bytes_response(_LOCAL_DEV_RECONCILE_BODY)
         
         # Run reconciliation
-        summary = await request.app.state.reconcile_handler.reconcile()
-        return summary
+        summary = await reconcile_handler.reconcile()
+        return _orjson_response(summary)
         
     except Exception as e:
         logger.error("Error during test reconciliation", exc_info=True)
-        return {
+        return _orjson_response({
             "status": "error",
-            "error": str(e),
-            "error_type": type(e).__name__,
-        }
+            "error": error_text(e),
+            "error_type": e.__class__.__name__,
+        })
 
 
-@app.post("/reconcile")
-async def reconcile(
-    request: Request,
-    authorization: str = Header(None),
-) -> Dict[str, Any]:
+async def _authorize_reconcile(
+    authorization: Optional[str],
+    cert_cache: GoogleCertCache,
+) -> None:
     """
-    Trigger manual reconciliation of all @capsync tasks.
+    Verify the authorization header for reconcile endpoints.
 
-    Requires authorization token in header.
+    Accepts either:
+    1. Bearer token with internal cron token
+    2. Google-signed OIDC token from Cloud Scheduler (starts with "Bearer eyJ"),
+       verified against Google's cached signing certificates and the configured
+       OIDC_AUDIENCE. OIDC tokens are rejected when no audience is configured,
+       so the client-supplied Host header is never trusted as the audience.
 
     Args:
-        request: FastAPI request object
-        authorization: Authorization header
+        authorization: Authorization header value
+        cert_cache: Google certificate cache for OIDC verification
 
-    Returns:
-        Reconciliation summary
+    Raises:
+        HTTPException: 401 if the header is missing or invalid
     """
-    # Check if running in local dev mode (no Firestore)
-    if not request.app.state.store:
-        return {
-            "status": "local_dev_mode",
-            "message": "Running in local dev mode without Firestore. Deploy to GCP for reconciliation.",
-        }
-    
-    # Verify authorization token
-    # Accept either:
-    # 1. Bearer token with internal cron token
-    # 2. OIDC token from Cloud Scheduler (starts with "Bearer eyJ")
     is_valid = False
-    
-    if authorization:
-        if authorization.startswith("Bearer eyJ"):
-            # This is likely an OIDC token from Cloud Scheduler
-            # In production, this would be validated against Google's public keys
-            # For now, we accept it as valid since Cloud Scheduler is authorized via IAM
-            is_valid = True
-            logger.info("Reconciliation triggered via Cloud Scheduler OIDC token")
+
+    if authorization is not None:
+        if authorization.startswith(_OIDC_AUTH_PREFIX):
+            claims = None
+            if settings.oidc_audience:
+                claims = await verify_oidc_token(
+                    authorization[len("Bearer ") :], settings.oidc_audience, cert_cache
+                )
+            else:
+                logger.error("OIDC audience not configured; rejecting OIDC token")
+            if claims is not None:
+                is_valid = True
+                logger.info(
+                    "Reconciliation triggered via Cloud Scheduler OIDC token",
+                    extra={"email": claims.get("email")},
+                )
         else:
-            # Check for Bearer token with internal cron token
-            expected_token = f"Bearer {settings.internal_cron_token}"
-            if authorization == expected_token:
+            # Check for Bearer token with internal cron token (constant-time)
+            if _CRON_AUTH_HEADER is not None and hmac.compare_digest(
+                authorization.encode("utf-8"), _CRON_AUTH_HEADER
+            ):
                 is_valid = True
                 logger.info("Reconciliation triggered via internal cron token")
-    
+
     if not is_valid:
         logger.warning("Unauthorized reconcile attempt", extra={"auth_header": authorization[:20] if authorization else None})
         raise HTTPException(
@@ -335,67 +706,183 @@ async def reconcile(
             detail="Invalid authorization token",
         )
 
-    try:
-        # Run reconciliation
-        summary = await request.app.state.reconcile_handler.reconcile()
-        return summary
 
-    except Exception as e:
-        logger.error("Error during reconciliation", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error during reconciliation: {str(e)}",
-        )
+@app.post("/reconcile", status_code=status.HTTP_202_ACCEPTED, response_model=None)
+async def reconcile(
+    background_tasks: BackgroundTasks,
+    authorization: str = Header(None),
+    store: Optional[FirestoreStore] = Depends(get_store),
+    reconcile_handler: ReconcileHandler = Depends(get_reconcile_handler),
+    oidc_cert_cache: GoogleCertCache = Depends(get_oidc_cert_cache),
+) -> Response:
+    """
+    Trigger reconciliation of all @capsync tasks in the background.
 
+    Requires authorization token in header. The run is scheduled after the
+    response is sent, so callers (Cloud Scheduler) get a 202 immediately
+    instead of holding the connection open for the whole reconcile. Use
+    GET /reconcile/{run_id} to follow the run, or GET /reconcile/status for
+    the outcome of the last one.
 
-@app.get("/")
-async def root(request: Request) -> Dict[str, Any]:
-    """Root endpoint."""
-    gcp_available = request.app.state.store is not None and request.app.state.pubsub_publisher is not None
-    return {
+    Args:
+        background_tasks: FastAPI background task queue
+        authorization: Authorization header
+        store: Firestore store (None in local dev mode)
+        reconcile_handler: Reconcile handler
+        oidc_cert_cache: Google certificate cache for OIDC verification
+
+    Returns:
+        Acceptance status with the run ID, or already_running
+    """
+    # Check if running in local dev mode (no Firestore)
+    if not store:
+        return _json_bytes_response(_LOCAL_DEV_RECONCILE_BODY)
+
+    await _authorize_reconcile(authorization, oidc_cert_cache)
+
+    run_id = await reconcile_handler.start_run()
+    if run_id is None:
+        return _orjson_response({"status": "already_running"}, status.HTTP_202_ACCEPTED)
+
+    background_tasks.add_task(reconcile_handler.run_in_background, run_id)
+    return _orjson_response({"status": "accepted", "run_id": run_id}, status.HTTP_202_ACCEPTED)
+
+
+@app.get("/reconcile/status", response_model=None)
+async def reconcile_status(
+    authorization: str = Header(None),
+    store: Optional[FirestoreStore] = Depends(get_store),
+    reconcile_handler: ReconcileHandler = Depends(get_reconcile_handler),
+    oidc_cert_cache: GoogleCertCache = Depends(get_oidc_cert_cache),
+) -> Response:
+    """
+    Report whether a reconciliation is running and the last run's summary.
+
+    Args:
+        authorization: Authorization header
+        store: Firestore store (None in local dev mode)
+        reconcile_handler: Reconcile handler
+        oidc_cert_cache: Google certificate cache for OIDC verification
+
+    Returns:
+        Running flag and last recorded summary
+    """
+    if not store:
+        return _json_bytes_response(_LOCAL_DEV_RECONCILE_BODY)
+
+    await _authorize_reconcile(authorization, oidc_cert_cache)
+
+    last_run = await store.get_last_reconcile_summary()
+    return _orjson_response({"running": reconcile_handler.is_running, "last_run": last_run})
+
+
+# Registered after /reconcile/status so "status" isn't captured as a run ID
+@app.get("/reconcile/{run_id}", response_model=None)
+async def reconcile_run(
+    run_id: str,
+    authorization: str = Header(None),
+    store: Optional[FirestoreStore] = Depends(get_store),
+    oidc_cert_cache: GoogleCertCache = Depends(get_oidc_cert_cache),
+) -> Response:
+    """
+    Report the status of one reconciliation run.
+
+    Args:
+        run_id: Run ID returned by POST /reconcile
+        authorization: Authorization header
+        store: Firestore store (None in local dev mode)
+        oidc_cert_cache: Google certificate cache for OIDC verification
+
+    Returns:
+        Run record: "running" until it finishes, then the reconcile summary
+
+    Raises:
+        HTTPException: 404 if the run ID is unknown
+    """
+    if not store:
+        return _json_bytes_response(_LOCAL_DEV_RECONCILE_BODY)
+
+    await _authorize_reconcile(authorization, oidc_cert_cache)
+
+    run = await store.get_reconcile_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown reconcile run")
+    return _orjson_response(run)
+
+
+@lru_cache(maxsize=8)
+def _root_body(prod_mode: bool, has_firestore: bool, has_pubsub: bool) -> bytes:
+    """
+    Serialize the root endpoint payload for one client configuration.
+
+    The inputs are fixed once the app has started, so the body is encoded
+    once and the cached bytes are reused on every later request.
+
+    Args:
+        prod_mode: Whether the app runs in production mode
+        has_firestore: Whether a Firestore client is available
+        has_pubsub: Whether a Pub/Sub publisher is available
+
+    Returns:
+        JSON-encoded root payload
+    """
+    return orjson.dumps({
         "service": "Todoist-Notion Sync",
         "version": "1.0.0",
         "status": "running",
-        "mode": "production" if gcp_available else "local_dev",
+        "mode": "production" if prod_mode else "local_dev",
         "gcp_clients": {
-            "firestore": request.app.state.store is not None,
-            "pubsub": request.app.state.pubsub_publisher is not None,
+            "firestore": has_firestore,
+            "pubsub": has_pubsub,
         },
-    }
+    })
 
 
-@app.get("/test/todoist")
-async def test_todoist(request: Request, show_tasks: bool = False, capsync_only: bool = False) -> Dict[str, Any]:
+@app.get("/", response_model=None)
+async def root(
+    prod_mode: bool = Depends(get_prod_mode),
+    store: Optional[FirestoreStore] = Depends(get_store),
+    pubsub_publisher: Optional[pubsub_v1.PublisherClient] = Depends(get_pubsub_publisher),
+) -> Response:
+    """Root endpoint."""
+    return _json_bytes_response(
+        _root_body(bool(prod_mode), store is not None, pubsub_publisher is not None)
+    )
+
+
+@app.get("/test/todoist", response_model=None)
+async def test_todoist(
+    show_tasks: bool = False,
+    capsync_only: bool = False,
+    todoist_client: TodoistClient = Depends(get_todoist_client),
+) -> Response:
     """Test Todoist API connection."""
     try:
-        projects = await request.app.state.todoist_client.get_projects()
+        projects = await todoist_client.get_projects()
         result = {
             "status": "success",
             "message": "Todoist API connected successfully",
             "project_count": len(projects),
-            "projects": [{"id": p.id, "name": p.name} for p in projects[:5]],  # First 5
+            "projects": [
+                dict(zip(_PROJECT_SUMMARY_FIELDS, _project_summary_values(p)))
+                for p in islice(projects, _TEST_PROJECT_LIMIT)
+            ],
         }
         
         # Optionally show tasks
         if show_tasks or capsync_only:
             if capsync_only:
                 # Get only tasks with @capsync label
-                tasks = await request.app.state.todoist_client.get_active_tasks_with_label("@capsync")
+                tasks = await todoist_client.get_active_tasks_with_label("@capsync")
                 result["message"] = "Found tasks with @capsync label"
                 result["capsync_task_count"] = len(tasks)
             else:
-                # Get all tasks
-                tasks = await request.app.state.todoist_client.get_tasks()
-                result["task_count"] = len(tasks)
-            
+                # Only fetch the tasks we show instead of paging through the whole account
+                tasks = await todoist_client.get_tasks(limit=_TEST_TASK_LIMIT)
+
             result["tasks"] = [
-                {
-                    "id": t.id,
-                    "content": t.content,
-                    "labels": t.labels,
-                    "project_id": t.project_id,
-                }
-                for t in tasks[:20]  # Show up to 20 tasks
+                dict(zip(_TASK_SUMMARY_FIELDS, _task_summary_values(t)))
+                for t in islice(tasks, _TEST_TASK_LIMIT)
             ]
             
             if capsync_only and len(tasks) == 0:
@@ -403,30 +890,41 @@ async def test_todoist(request: Request, show_tasks: bool = False, capsync_only:
             elif not capsync_only:
                 result["note"] = "Use ?capsync_only=true to see only tasks with @capsync label"
         
-        return result
+        return _orjson_response(result)
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "Todoist API returned an error status",
+            extra={"status_code": e.response.status_code, "url": str(e.request.url)},
+        )
+        return _orjson_response({
+            "status": "error",
+            "message": f"Todoist API error: HTTP {e.response.status_code}",
+        })
     except Exception as e:
         logger.error("Error testing Todoist API", exc_info=True)
-        return {
+        return _orjson_response({
             "status": "error",
-            "message": f"Todoist API error: {str(e)}",
-        }
+            "message": f"Todoist API error: {error_text(e)}",
+        })
 
 
-@app.get("/test/notion")
-async def test_notion(request: Request) -> Dict[str, Any]:
+@app.get("/test/notion", response_model=None)
+async def test_notion(notion_client: NotionClient = Depends(get_notion_client)) -> Response:
     """Test Notion API connection and database access."""
     try:
-        # Try to query both databases to verify access
-        tasks_result = await request.app.state.notion_client.client.databases.query(
-            database_id=settings.notion_tasks_database_id,
-            page_size=1,
-        )
-        projects_result = await request.app.state.notion_client.client.databases.query(
-            database_id=settings.notion_projects_database_id,
-            page_size=1,
+        # Query both databases concurrently to verify access
+        tasks_result, projects_result = await asyncio.gather(
+            notion_client.client.databases.query(
+                database_id=settings.notion_tasks_database_id,
+                page_size=1,
+            ),
+            notion_client.client.databases.query(
+                database_id=settings.notion_projects_database_id,
+                page_size=1,
+            ),
         )
         
-        return {
+        return _orjson_response({
             "status": "success",
             "message": "Notion API connected successfully",
             "databases": {
@@ -441,18 +939,23 @@ async def test_notion(request: Request) -> Dict[str, Any]:
                     "pages_found": len(projects_result.get("results", [])),
                 },
             },
-        }
+        })
     except Exception as e:
         logger.error("Error testing Notion API", exc_info=True)
-        return {
+        return _orjson_response({
             "status": "error",
-            "message": f"Notion API error: {str(e)}",
-            "error_type": type(e).__name__,
-        }
-
-
-@app.get("/test/sync-task/{task_id}")
-async def test_sync_task(task_id: str, request: Request, dry_run: bool = True) -> Dict[str, Any]:
+            "message": f"Notion API error: {error_text(e)}",
+            "error_type": e.__class__.__name__,
+        })
+
+
+@app.get("/test/sync-task/{task_id}", response_model=None)
+async def test_sync_task(
+    task_id: str,
+    dry_run: bool = True,
+    todoist_client: TodoistClient = Depends(get_todoist_client),
+    notion_client: NotionClient = Depends(get_notion_client),
+) -> Response:
     """
     Test syncing a single task to Notion (demonstrates the full workflow).
     
@@ -474,32 +977,27 @@ async def test_sync_task(task_id: str, request: Request, dry_run: bool = True) -
         )
 
     try:
-        from app.mapper import map_project_to_notion, map_task_to_todo
-        from app.utils import has_capsync_label
-        
         # 1. Fetch task from Todoist
-        logger.info(f"Fetching task {task_id} from Todoist")
-        task = await request.app.state.todoist_client.get_task(task_id)
+        logger.info("Fetching task %s from Todoist", task_id)
+        task = await todoist_client.get_task(task_id)
         
         # 2. Check for @capsync label
         if not has_capsync_label(task.labels):
-            return {
+            return _orjson_response({
                 "status": "skipped",
                 "message": f"Task '{task.content}' does not have @capsync label",
                 "task_id": task_id,
                 "labels": task.labels,
                 "note": "Add the @capsync label to this task in Todoist to sync it",
-            }
-        
-        # 3. Fetch related data
-        project = await request.app.state.todoist_client.get_project(task.project_id)
-        comments = await request.app.state.todoist_client.get_comments(task_id)
+            })
         
-        # Get section name if exists
-        section_name = None
-        if task.section_id:
-            section = await request.app.state.todoist_client.get_section(task.section_id)
-            section_name = section.name
+        # 3. Fetch related data (independent requests, issued concurrently)
+        project, comments, section = await asyncio.gather(
+            todoist_client.get_project(task.project_id),
+            todoist_client.get_comments(task_id),
+            todoist_client.get_section(task.section_id) if task.section_id else _none(),
+        )
+        section_name = section.name if section else None
         
         # 4. Map to Notion models
         notion_project = map_project_to_notion(project)
@@ -508,7 +1006,7 @@ async def test_sync_task(task_id: str, request: Request, dry_run: bool = True) -
         # 5. Either simulate or actually create
         if dry_run:
             # Simulation mode - just show what would happen
-            return {
+            return _orjson_response({
                 "status": "success",
                 "message": "Task sync simulation complete (dry run)",
                 "todoist_task": {
@@ -535,46 +1033,46 @@ async def test_sync_task(task_id: str, request: Request, dry_run: bool = True) -
                     },
                 },
                 "note": "Add ?dry_run=false to actually create these pages in Notion",
-            }
+            })
         else:
             # Actually create in Notion
-            logger.info(f"Actually creating Notion pages for task {task_id}")
+            logger.info("Actually creating Notion pages for task %s", task_id)
             
             try:
                 # 1. Check if project page already exists
-                existing_project = await request.app.state.notion_client.find_project_by_todoist_id(
+                existing_project = await notion_client.find_project_by_todoist_id(
                     project.id
                 )
                 
                 if existing_project:
-                    logger.info(f"Project page already exists: {existing_project['id']}")
+                    logger.info("Project page already exists: %s", existing_project['id'])
                     project_page_id = existing_project["id"]
                     project_result = {"status": "already_exists", "page_id": project_page_id}
                 else:
                     # Create new project page
-                    logger.info(f"Creating new project page for: {project.name}")
-                    project_page = await request.app.state.notion_client.create_project_page(notion_project)
+                    logger.info("Creating new project page for: %s", project.name)
+                    project_page = await notion_client.create_project_page(notion_project)
                     project_page_id = project_page["id"]
                     project_result = {"status": "created", "page_id": project_page_id}
                 
                 # 2. Check if todo page already exists
-                existing_todo = await request.app.state.notion_client.find_todo_by_todoist_id(task.id)
+                existing_todo = await notion_client.find_todo_by_todoist_id(task.id)
                 
                 if existing_todo:
-                    logger.info(f"Todo page already exists: {existing_todo['id']}, updating it")
-                    todo_page = await request.app.state.notion_client.update_todo_page(
+                    logger.info("Todo page already exists: %s, updating it", existing_todo['id'])
+                    todo_page = await notion_client.update_todo_page(
                         existing_todo["id"], todo
                     )
                     todo_result = {"status": "updated", "page_id": todo_page["id"]}
                 else:
                     # Create new todo page
-                    logger.info(f"Creating new todo page: {todo.title}")
-                    todo_page = await request.app.state.notion_client.create_todo_page(
+                    logger.info("Creating new todo page: %s", todo.title)
+                    todo_page = await notion_client.create_todo_page(
                         todo, project_page_id
                     )
                     todo_result = {"status": "created", "page_id": todo_page["id"]}
                 
-                return {
+                return _orjson_response({
                     "status": "success",
                     "message": "Successfully synced to Notion!",
                     "todoist_task": {
@@ -590,26 +1088,44 @@ async def test_sync_task(task_id: str, request: Request, dry_run: bool = True) -
                         "project_page": f"https://notion.so/{project_page_id.replace('-', '')}",
                         "todo_page": f"https://notion.so/{todo_result['page_id'].replace('-', '')}",
                     },
-                }
+                })
             except Exception as create_error:
-                logger.error(f"Error creating in Notion: {create_error}", exc_info=True)
-                return {
+                logger.error("Error creating in Notion: %s", create_error, exc_info=True)
+                return _orjson_response({
                     "status": "error",
-                    "message": f"Failed to create in Notion: {str(create_error)}",
-                    "error_type": type(create_error).__name__,
+                    "message": f"Failed to create in Notion: {error_text(create_error)}",
+                    "error_type": create_error.__class__.__name__,
                     "note": "Check the logs for detailed error. Verify your Notion database IDs and permissions.",
-                }
+                })
         
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "Todoist API returned an error status",
+            extra={
+                "task_id": task_id,
+                "status_code": e.response.status_code,
+                "url": str(e.request.url),
+            },
+        )
+        return _orjson_response({
+            "status": "error",
+            "message": f"Todoist API error: HTTP {e.response.status_code}",
+        })
     except Exception as e:
-        logger.error(f"Error testing sync for task {task_id}", exc_info=True)
-        return {
+        logger.error("Error testing sync for task %s", task_id, exc_info=True)
+        return _orjson_response({
             "status": "error",
-            "message": f"Error: {str(e)}",
-        }
+            "message": f"Error: {error_text(e)}",
+        })
 
 
 @app.post("/migrate/v1-ids")
-async def migrate_v1_ids(request: Request, dry_run: bool = True) -> Dict[str, Any]:
+async def migrate_v1_ids(
+    dry_run: bool = True,
+    todoist: TodoistClient = Depends(get_todoist_client),
+    notion: NotionClient = Depends(get_notion_client),
+    store: Optional[FirestoreStore] = Depends(get_store),
+) -> Dict[str, Any]:
     """
     One-time migration: Update Notion pages and Firestore with new v1 Todoist IDs.
 
@@ -625,349 +1141,35 @@ async def migrate_v1_ids(request: Request, dry_run: bool = True) -> Dict[str, An
     Args:
         dry_run: If True, only report what would change. If False, execute migration.
     """
-    if not request.app.state.store:
+    if not store:
         return {"status": "error", "message": "Firestore not available"}
 
     try:
-        from datetime import datetime
-        from app.models import TaskSyncState, ProjectSyncState, SyncStatus
-        from app.utils import compute_payload_hash
-        from app.mapper import map_task_to_todo, map_project_to_notion
-
-        todoist = request.app.state.todoist_client
-        notion = request.app.state.notion_client
-        store = request.app.state.store
-
-        # Step 1: Fetch all v1 tasks with capsync label
-        logger.info("Migration: Fetching all v1 tasks with capsync label")
-        v1_tasks = await todoist.get_active_tasks_with_label("capsync")
-        logger.info(f"Migration: Found {len(v1_tasks)} v1 tasks")
-
-        # Build lookup: title -> list of v1 tasks
-        v1_by_title: Dict[str, list] = {}
-        for task in v1_tasks:
-            title = task.content.strip()
-            if title not in v1_by_title:
-                v1_by_title[title] = []
-            v1_by_title[title].append(task)
-
-        # Step 2: Fetch all v1 projects
-        logger.info("Migration: Fetching all v1 projects")
-        v1_projects = await todoist.get_projects()
-        v1_projects_by_name: Dict[str, Any] = {}
-        for proj in v1_projects:
-            v1_projects_by_name[proj.name.strip()] = proj
-
-        # Step 3: Fetch all existing Notion task pages
-        logger.info("Migration: Fetching all Notion task pages")
-        notion_pages = await notion.get_all_task_pages()
-        logger.info(f"Migration: Found {len(notion_pages)} Notion task pages")
-
-        # Step 4: Fetch all existing Notion project pages
-        logger.info("Migration: Fetching all Notion project pages")
-        notion_project_pages = await notion.get_all_project_pages()
-        logger.info(f"Migration: Found {len(notion_project_pages)} Notion project pages")
-
-        # Helper functions
-        def _get_text_prop(page, prop_name):
-            props = page.get("properties", {})
-            prop = props.get(prop_name, {})
-            if "rich_text" in prop and prop["rich_text"]:
-                return prop["rich_text"][0].get("text", {}).get("content", "")
-            if "title" in prop and prop["title"]:
-                return prop["title"][0].get("text", {}).get("content", "")
-            return ""
-
-        def _is_v1_id(task_id):
-            return task_id and not task_id.isdigit()
-
-        # Categorize task pages
-        old_id_pages = []
-        new_id_pages = []
-        no_id_pages = []
-
-        for page in notion_pages:
-            todoist_id = _get_text_prop(page, "Todoist Task ID")
-            title = _get_text_prop(page, "Name")
-
-            if not todoist_id:
-                no_id_pages.append({"page": page, "title": title})
-            elif _is_v1_id(todoist_id):
-                new_id_pages.append({"page": page, "title": title, "todoist_id": todoist_id})
-            else:
-                old_id_pages.append({"page": page, "title": title, "todoist_id": todoist_id})
-
-        logger.info(
-            "Migration: Page categorization",
-            extra={
-                "old_id_pages": len(old_id_pages),
-                "new_id_pages": len(new_id_pages),
-                "no_id_pages": len(no_id_pages),
-            },
-        )
-
-        # Match old-ID pages to v1 tasks by title
-        matched_tasks = []
-        unmatched_old_pages = []
-        duplicate_new_pages_to_archive = []
-
-        # Index new-ID pages by title for duplicate detection
-        new_id_titles: Dict[str, list] = {}
-        for entry in new_id_pages:
-            title = entry["title"].strip()
-            if title not in new_id_titles:
-                new_id_titles[title] = []
-            new_id_titles[title].append(entry)
-
-        for entry in old_id_pages:
-            title = entry["title"].strip()
-            page = entry["page"]
-            old_id = entry["todoist_id"]
-
-            candidates = v1_by_title.get(title, [])
-
-            if len(candidates) == 1:
-                v1_task = candidates[0]
-                matched_tasks.append({
-                    "notion_page_id": page["id"],
-                    "title": title,
-                    "old_id": old_id,
-                    "new_id": v1_task.id,
-                    "project_id": v1_task.project_id,
-                })
-
-                # Flag duplicate new-ID pages for archival
-                if title in new_id_titles:
-                    for dup_entry in new_id_titles[title]:
-                        if dup_entry["todoist_id"] == v1_task.id:
-                            duplicate_new_pages_to_archive.append({
-                                "page_id": dup_entry["page"]["id"],
-                                "title": title,
-                                "todoist_id": dup_entry["todoist_id"],
-                            })
-
-            elif len(candidates) > 1:
-                v1_task = candidates[0]
-                matched_tasks.append({
-                    "notion_page_id": page["id"],
-                    "title": title,
-                    "old_id": old_id,
-                    "new_id": v1_task.id,
-                    "project_id": v1_task.project_id,
-                    "ambiguous": True,
-                    "candidate_count": len(candidates),
-                })
-
-                if title in new_id_titles:
-                    for dup_entry in new_id_titles[title]:
-                        if dup_entry["todoist_id"] == v1_task.id:
-                            duplicate_new_pages_to_archive.append({
-                                "page_id": dup_entry["page"]["id"],
-                                "title": title,
-                                "todoist_id": dup_entry["todoist_id"],
-                            })
-            else:
-                unmatched_old_pages.append({
-                    "notion_page_id": page["id"],
-                    "title": title,
-                    "old_id": old_id,
-                })
-
-        # Identify genuinely new pages (v1 tasks that had no old-ID page)
-        matched_new_ids = {m["new_id"] for m in matched_tasks}
-        dup_page_ids = {d["page_id"] for d in duplicate_new_pages_to_archive}
-        genuinely_new_pages = [
-            entry for entry in new_id_pages
-            if entry["todoist_id"] not in matched_new_ids
-            and entry["page"]["id"] not in dup_page_ids
-        ]
-
-        # Match project pages
-        matched_projects = []
-        for proj_page in notion_project_pages:
-            proj_todoist_id = _get_text_prop(proj_page, "Todoist Project ID")
-            proj_name = _get_text_prop(proj_page, "Name")
-
-            if proj_todoist_id and not _is_v1_id(proj_todoist_id):
-                v1_proj = v1_projects_by_name.get(proj_name.strip())
-                if v1_proj:
-                    matched_projects.append({
-                        "notion_page_id": proj_page["id"],
-                        "name": proj_name,
-                        "old_id": proj_todoist_id,
-                        "new_id": v1_proj.id,
-                    })
-
-        summary: Dict[str, Any] = {
-            "status": "dry_run" if dry_run else "executed",
-            "v1_tasks_count": len(v1_tasks),
-            "notion_task_pages": len(notion_pages),
-            "notion_project_pages": len(notion_project_pages),
-            "categorization": {
-                "old_id_pages": len(old_id_pages),
-                "new_id_pages": len(new_id_pages),
-                "no_id_pages": len(no_id_pages),
-            },
-            "tasks": {
-                "matched": len(matched_tasks),
-                "ambiguous": len([m for m in matched_tasks if m.get("ambiguous")]),
-                "unmatched_old": len(unmatched_old_pages),
-                "duplicates_to_archive": len(duplicate_new_pages_to_archive),
-                "genuinely_new": len(genuinely_new_pages),
-            },
-            "projects": {"matched": len(matched_projects)},
-        }
-
-        if dry_run:
-            summary["matched_tasks_sample"] = matched_tasks[:15]
-            summary["unmatched_old_sample"] = unmatched_old_pages[:15]
-            summary["duplicates_sample"] = duplicate_new_pages_to_archive[:15]
-            summary["genuinely_new_sample"] = [
-                {"title": e["title"], "todoist_id": e["todoist_id"]}
-                for e in genuinely_new_pages[:15]
-            ]
-            summary["matched_projects_sample"] = matched_projects[:15]
-            summary["note"] = "POST with ?dry_run=false to execute migration"
-            return summary
-
-        # === EXECUTE MIGRATION ===
-        logger.info("Migration: EXECUTING (not dry run)")
-
-        # Update old-ID task pages with new v1 IDs
-        from app.utils import build_todoist_task_url, build_todoist_project_url
-
-        tasks_updated = 0
-        tasks_failed = 0
-        for match in matched_tasks:
-            try:
-                await notion.update_todoist_task_id(match["notion_page_id"], match["new_id"])
-                await notion.client.pages.update(
-                    page_id=match["notion_page_id"],
-                    properties={"Todoist URL": {"url": build_todoist_task_url(match["new_id"])}},
-                )
-                tasks_updated += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to update task {match['notion_page_id']}: {e}")
-                tasks_failed += 1
-
-        # Archive duplicate pages
-        dups_archived = 0
-        for dup in duplicate_new_pages_to_archive:
-            try:
-                await notion.archive_page(dup["page_id"])
-                dups_archived += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to archive duplicate {dup['page_id']}: {e}")
-
-        # Update project pages
-        projects_updated = 0
-        for proj_match in matched_projects:
-            try:
-                await notion.update_todoist_project_id(proj_match["notion_page_id"], proj_match["new_id"])
-                await notion.client.pages.update(
-                    page_id=proj_match["notion_page_id"],
-                    properties={"Todoist URL": {"url": build_todoist_project_url(proj_match["new_id"])}},
-                )
-                projects_updated += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to update project {proj_match['notion_page_id']}: {e}")
-
-        # Rebuild Firestore state
-        logger.info("Migration: Clearing old Firestore task states")
-        cleared = await store.clear_all_task_states()
-
-        # Save states for matched (migrated) tasks
-        states_saved = 0
-        v1_tasks_map = {t.id: t for t in v1_tasks}
-        v1_projects_map = {p.id: p for p in v1_projects}
-
-        for match in matched_tasks:
-            try:
-                v1_task = v1_tasks_map.get(match["new_id"])
-                if v1_task:
-                    project = v1_projects_map.get(v1_task.project_id)
-                    if project:
-                        todo = map_task_to_todo(v1_task, project, [], None)
-                        state = TaskSyncState(
-                            todoist_task_id=match["new_id"],
-                            capacities_object_id=match["notion_page_id"],
-                            payload_hash=compute_payload_hash(todo.model_dump()),
-                            last_synced_at=datetime.now(),
-                            sync_status=SyncStatus.OK,
-                            sync_source="migration",
-                        )
-                        await store.save_task_state(state)
-                        states_saved += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to save state for {match['new_id']}: {e}")
-
-        # Save states for genuinely new pages
-        new_states_saved = 0
-        for entry in genuinely_new_pages:
-            try:
-                v1_task = v1_tasks_map.get(entry["todoist_id"])
-                if v1_task:
-                    project = v1_projects_map.get(v1_task.project_id)
-                    if project:
-                        todo = map_task_to_todo(v1_task, project, [], None)
-                        state = TaskSyncState(
-                            todoist_task_id=entry["todoist_id"],
-                            capacities_object_id=entry["page"]["id"],
-                            payload_hash=compute_payload_hash(todo.model_dump()),
-                            last_synced_at=datetime.now(),
-                            sync_status=SyncStatus.OK,
-                            sync_source="migration",
-                        )
-                        await store.save_task_state(state)
-                        new_states_saved += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to save new state for {entry['todoist_id']}: {e}")
-
-        # Save project states
-        proj_states_saved = 0
-        for proj_match in matched_projects:
-            try:
-                v1_proj = v1_projects_map.get(proj_match["new_id"])
-                if v1_proj:
-                    notion_proj = map_project_to_notion(v1_proj)
-                    proj_state = ProjectSyncState(
-                        todoist_project_id=proj_match["new_id"],
-                        capacities_object_id=proj_match["notion_page_id"],
-                        payload_hash=compute_payload_hash(notion_proj.model_dump()),
-                        last_synced_at=datetime.now(),
-                    )
-                    await store.save_project_state(proj_state)
-                    proj_states_saved += 1
-            except Exception as e:
-                logger.warning(f"Migration: Failed to save project state for {proj_match['new_id']}: {e}")
-
-        summary["execution"] = {
-            "tasks_updated": tasks_updated,
-            "tasks_failed": tasks_failed,
-            "duplicates_archived": dups_archived,
-            "projects_updated": projects_updated,
-            "firestore_cleared": cleared,
-            "task_states_saved": states_saved,
-            "new_task_states_saved": new_states_saved,
-            "project_states_saved": proj_states_saved,
-        }
-
-        logger.info("Migration: COMPLETED", extra=summary["execution"])
-        return summary
-
+        return await run_v1_id_migration(todoist, notion, store, dry_run=dry_run)
     except Exception as e:
         logger.error("Migration: FAILED", exc_info=True)
-        return {"status": "error", "error": str(e), "error_type": type(e).__name__}
+        return {"status": "error", "error": error_text(e), "error_type": e.__class__.__name__}
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-    )
-
+    # Auto-reload spawns a file watcher; only enable it for local development
+    if settings.environment == "local":
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info",
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.uvicorn_workers,
+            loop="uvloop",
+            http="httptools",
+            log_level="info",
+        )
@@ -1,5 +1,6 @@
 """Data mapping logic from Todoist to Notion."""
 
+import logging
 from datetime import datetime
 from typing import List, Optional
 
@@ -11,7 +12,13 @@ from app.models import (
     TodoistProject,
     TodoistTask,
 )
-from app.utils import build_todoist_project_url, build_todoist_task_url, format_markdown_comments, get_current_timestamp, strip_notion_backlink
+from app.utils import (
+    build_todoist_project_url,
+    build_todoist_task_url,
+    format_markdown_comments,
+    get_current_timestamp,
+    strip_notion_backlink,
+)
 
 logger = get_logger(__name__)
 
@@ -21,6 +28,7 @@ def map_task_to_todo(
     project: TodoistProject,
     comments: List[TodoistComment],
     section_name: Optional[str] = None,
+    now: Optional[str] = None,
 ) -> NotionToDo:
     """
     Map a Todoist task to a Notion ToDo page.
@@ -30,14 +38,17 @@ def map_task_to_todo(
         project: Todoist project the task belongs to
         comments: List of task comments
         section_name: Section name if task is in a section
+        now: ISO timestamp to stamp the ToDo with, so bulk callers can
+            reuse one clock read (defaults to the current time)
 
     Returns:
         NotionToDo object ready for sync
     """
-    logger.info(
-        "Mapping Todoist task to Notion ToDo",
-        extra={"task_id": task.id, "content": task.content},
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Mapping Todoist task to Notion ToDo",
+            extra={"task_id": task.id, "content": task.content},
+        )
 
     # Build body with description (strip Notion backlink to avoid circular sync)
     body = strip_notion_backlink(task.description) if task.description else ""
@@ -48,14 +59,11 @@ def map_task_to_todo(
     due_timezone = None
 
     if task.due:
-        due_date = task.due.date
         due_timezone = task.due.timezone
 
-        # Check if it includes time (has 'T' in date string)
-        if "T" in task.due.date:
-            # Split date and time
-            date_part, time_part = task.due.date.split("T")
-            due_date = date_part
+        # Split date and time in one scan ('T' is only present when a time is set)
+        due_date, has_time, time_part = task.due.date.partition("T")
+        if has_time:
             due_time = time_part
 
     # Format comments
@@ -64,7 +72,8 @@ def map_task_to_todo(
     )
 
     # Current timestamp
-    now = get_current_timestamp()
+    if now is None:
+        now = get_current_timestamp()
 
     return NotionToDo(
         title=task.content,
@@ -101,10 +110,11 @@ def map_project_to_notion(project: TodoistProject) -> NotionProject:
     Returns:
         NotionProject object
     """
-    logger.info(
-        "Mapping Todoist project to Notion Project",
-        extra={"project_id": project.id, "project_name": project.name},
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Mapping Todoist project to Notion Project",
+            extra={"project_id": project.id, "project_name": project.name},
+        )
 
     return NotionProject(
         todoist_project_id=project.id,
@@ -127,10 +137,11 @@ def create_archived_todo(task: TodoistTask, project: TodoistProject) -> NotionTo
     Returns:
         NotionToDo with archived status
     """
-    logger.info(
-        "Creating archived ToDo",
-        extra={"task_id": task.id},
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Creating archived ToDo",
+            extra={"task_id": task.id},
+        )
 
     now = get_current_timestamp()
 
@@ -0,0 +1,463 @@
+"""One-time migration of Notion pages and Firestore state to Todoist v1 IDs."""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple
+
+from app.logging_setup import get_logger
+from app.mapper import map_project_to_notion, map_task_to_todo
+from app.models import ProjectSyncState, SyncStatus, TaskSyncState
+from app.notion_client import NotionClient
+from app.settings import settings
+from app.store import FirestoreStore
+from app.todoist_client import TodoistClient
+from app.utils import (
+    build_todoist_project_url,
+    build_todoist_task_url,
+    get_current_timestamp,
+)
+
+logger = get_logger(__name__)
+
+# Bound once so the per-page ID check skips the attribute lookup
+_isdigit = str.isdigit
+
+
+def _notion_text(props: Dict[str, Any], prop_name: str) -> str:
+    """
+    Get the plain text of a Notion rich_text or title property.
+
+    Indexes straight down to the first segment's content, so the common case
+    is a single chain of subscripts. A missing key or an empty segment list
+    falls through to the title, then to "".
+
+    Args:
+        props: The page's "properties" mapping, bound once per page by callers
+            that read several properties
+        prop_name: Property name
+
+    Returns:
+        Text of the first rich_text (or title) segment, or "" if there is none
+    """
+    try:
+        prop = props[prop_name]
+    except (KeyError, TypeError):
+        return ""
+    try:
+        return prop["rich_text"][0]["text"]["content"]
+    except (KeyError, IndexError, TypeError):
+        pass
+    try:
+        return prop["title"][0]["text"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+
+def _is_v1_id(task_id: str) -> bool:
+    """
+    Tell whether a Todoist ID uses the alphanumeric v1 format.
+
+    Legacy IDs are all digits. IDs are short, so one C-level isdigit() scan
+    beats peeking at the first character before it.
+
+    Args:
+        task_id: Todoist task or project ID (may be empty)
+
+    Returns:
+        True for a non-empty, non-numeric ID
+    """
+    return task_id != "" and not _isdigit(task_id)
+
+
+def _without_models(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Drop the matched Todoist model from a match entry for the JSON summary.
+
+    Args:
+        entry: Task or project match entry
+
+    Returns:
+        Copy of the entry without its "v1_task"/"v1_project" key
+    """
+    return {k: v for k, v in entry.items() if k not in ("v1_task", "v1_project")}
+
+
+async def _gather_bounded(
+    semaphore: asyncio.Semaphore,
+    calls: Iterable[Awaitable[Any]],
+) -> List[Any]:
+    """
+    Await calls concurrently, at most as many at once as the semaphore allows.
+
+    Args:
+        semaphore: Semaphore shared by every Notion write in the migration
+        calls: Awaitables to run
+
+    Returns:
+        Results in input order, with exceptions returned instead of raised
+    """
+    async def _bounded(call: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(_bounded(call) for call in calls), return_exceptions=True)
+
+
+async def run_v1_id_migration(
+    todoist: TodoistClient,
+    notion: NotionClient,
+    store: FirestoreStore,
+    dry_run: bool = True,
+) -> Dict[str, Any]:
+    """
+    Match Notion pages carrying legacy Todoist IDs to v1 tasks and projects.
+
+    Old-ID pages are matched to v1 tasks by exact title. New-ID pages created
+    during the first v1 reconciliation that duplicate a matched task are
+    flagged for archival.
+
+    Args:
+        todoist: Todoist API client
+        notion: Notion API client
+        store: Firestore store
+        dry_run: If True, only report what would change
+
+    Returns:
+        Migration summary, with samples (dry run) or execution counts
+    """
+    # Fetch v1 capsync tasks, v1 projects, and all Notion project pages
+    # (independent requests, issued concurrently). Task pages are streamed below.
+    logger.info("Migration: Fetching v1 tasks/projects and Notion project pages")
+    v1_tasks, v1_projects, notion_project_pages = await asyncio.gather(
+        todoist.get_active_tasks_with_label("capsync"),
+        todoist.get_projects(),
+        notion.get_all_project_pages(),
+    )
+    logger.info(
+        "Migration: Fetched source data",
+        extra={
+            "v1_tasks": len(v1_tasks),
+            "v1_projects": len(v1_projects),
+            "notion_project_pages": len(notion_project_pages),
+        },
+    )
+
+    # Build lookup: title -> list of v1 tasks
+    v1_by_title: Dict[str, list] = defaultdict(list)
+    for task in v1_tasks:
+        v1_by_title[task.content.strip()].append(task)
+
+    v1_projects_by_name: Dict[str, Any] = {proj.name.strip(): proj for proj in v1_projects}
+
+    # Stream task pages, categorizing them and matching old-ID pages to v1 tasks
+    # by title in one pass; only the fields needed later are kept per page
+    notion_pages_count = 0
+    old_id_count = 0
+    no_id_count = 0
+    new_id_pages = []
+    matched_tasks = []
+    matched_new_ids = set()
+    unmatched_old_pages = []
+    # Index new-ID pages by (title, v1 ID) so duplicate detection is one lookup
+    new_id_by_key: Dict[Tuple[str, str], list] = defaultdict(list)
+
+    async for page in notion.iter_task_pages():
+        notion_pages_count += 1
+        props = page.get("properties", {})
+        todoist_id = _notion_text(props, "Todoist Task ID")
+        title = _notion_text(props, "Name").strip()
+
+        if not todoist_id:
+            no_id_count += 1
+        elif _is_v1_id(todoist_id):
+            entry = {"page_id": page["id"], "title": title, "todoist_id": todoist_id}
+            new_id_pages.append(entry)
+            new_id_by_key[(title, todoist_id)].append(entry)
+        else:
+            old_id_count += 1
+            candidates = v1_by_title.get(title)
+            if candidates:
+                v1_task = candidates[0]
+                match = {
+                    "notion_page_id": page["id"],
+                    "title": title,
+                    "old_id": todoist_id,
+                    "new_id": v1_task.id,
+                    "todoist_url": build_todoist_task_url(v1_task.id),
+                    "project_id": v1_task.project_id,
+                    "v1_task": v1_task,
+                }
+                if len(candidates) > 1:
+                    match["ambiguous"] = True
+                    match["candidate_count"] = len(candidates)
+                matched_tasks.append(match)
+                matched_new_ids.add(v1_task.id)
+            else:
+                unmatched_old_pages.append({
+                    "notion_page_id": page["id"],
+                    "title": title,
+                    "old_id": todoist_id,
+                })
+
+    logger.info(
+        "Migration: Page categorization",
+        extra={
+            "old_id_pages": old_id_count,
+            "new_id_pages": len(new_id_pages),
+            "no_id_pages": no_id_count,
+        },
+    )
+
+    # Flag duplicate new-ID pages for archival. A new-ID page can come after
+    # the old-ID page it duplicates, so this runs once the index is complete.
+    duplicate_new_pages_to_archive = []
+    dup_page_ids = set()
+    for match in matched_tasks:
+        for dup_entry in new_id_by_key.get((match["title"], match["new_id"]), ()):
+            duplicate_new_pages_to_archive.append({
+                "page_id": dup_entry["page_id"],
+                "title": match["title"],
+                "todoist_id": dup_entry["todoist_id"],
+            })
+            dup_page_ids.add(dup_entry["page_id"])
+
+    # Identify genuinely new pages (v1 tasks that had no old-ID page)
+    genuinely_new_pages = [
+        entry for entry in new_id_pages
+        if entry["todoist_id"] not in matched_new_ids
+        and entry["page_id"] not in dup_page_ids
+    ]
+
+    # Match project pages
+    matched_projects = []
+    for proj_page in notion_project_pages:
+        proj_props = proj_page.get("properties", {})
+        proj_todoist_id = _notion_text(proj_props, "Todoist Project ID")
+        proj_name = _notion_text(proj_props, "Name").strip()
+
+        if proj_todoist_id and not _is_v1_id(proj_todoist_id):
+            v1_proj = v1_projects_by_name.get(proj_name)
+            if v1_proj:
+                matched_projects.append({
+                    "notion_page_id": proj_page["id"],
+                    "name": proj_name,
+                    "old_id": proj_todoist_id,
+                    "new_id": v1_proj.id,
+                    "todoist_url": build_todoist_project_url(v1_proj.id),
+                    "v1_project": v1_proj,
+                })
+
+    summary: Dict[str, Any] = {
+        "status": "dry_run" if dry_run else "executed",
+        "v1_tasks_count": len(v1_tasks),
+        "notion_task_pages": notion_pages_count,
+        "notion_project_pages": len(notion_project_pages),
+        "categorization": {
+            "old_id_pages": old_id_count,
+            "new_id_pages": len(new_id_pages),
+            "no_id_pages": no_id_count,
+        },
+        "tasks": {
+            "matched": len(matched_tasks),
+            "ambiguous": len([m for m in matched_tasks if m.get("ambiguous")]),
+            "unmatched_old": len(unmatched_old_pages),
+            "duplicates_to_archive": len(duplicate_new_pages_to_archive),
+            "genuinely_new": len(genuinely_new_pages),
+        },
+        "projects": {"matched": len(matched_projects)},
+    }
+
+    if dry_run:
+        summary["matched_tasks_sample"] = [_without_models(m) for m in matched_tasks[:15]]
+        summary["unmatched_old_sample"] = unmatched_old_pages[:15]
+        summary["duplicates_sample"] = duplicate_new_pages_to_archive[:15]
+        summary["genuinely_new_sample"] = [
+            {"title": e["title"], "todoist_id": e["todoist_id"]}
+            for e in genuinely_new_pages[:15]
+        ]
+        summary["matched_projects_sample"] = [_without_models(m) for m in matched_projects[:15]]
+        summary["note"] = "POST with ?dry_run=false to execute migration"
+        return summary
+
+    summary["execution"] = await _execute_migration(
+        notion,
+        store,
+        v1_tasks,
+        v1_projects,
+        matched_tasks,
+        duplicate_new_pages_to_archive,
+        genuinely_new_pages,
+        matched_projects,
+    )
+
+    logger.info("Migration: COMPLETED", extra=summary["execution"])
+    return summary
+
+
+async def _execute_migration(
+    notion: NotionClient,
+    store: FirestoreStore,
+    v1_tasks: List[Any],
+    v1_projects: List[Any],
+    matched_tasks: List[Dict[str, Any]],
+    duplicate_new_pages_to_archive: List[Dict[str, Any]],
+    genuinely_new_pages: List[Dict[str, Any]],
+    matched_projects: List[Dict[str, Any]],
+) -> Dict[str, int]:
+    """
+    Apply a planned migration to Notion and rebuild Firestore state.
+
+    Notion writes are issued concurrently, bounded by
+    ``settings.migration_concurrency`` so the integration stays within
+    Notion's rate limit.
+
+    Args:
+        notion: Notion API client
+        store: Firestore store
+        v1_tasks: All v1 capsync tasks
+        v1_projects: All v1 projects
+        matched_tasks: Old-ID task pages matched to v1 tasks
+        duplicate_new_pages_to_archive: New-ID pages duplicating a matched task
+        genuinely_new_pages: New-ID pages for tasks without an old-ID page
+        matched_projects: Old-ID project pages matched to v1 projects
+
+    Returns:
+        Execution counts
+    """
+    logger.info("Migration: EXECUTING (not dry run)")
+    semaphore = asyncio.Semaphore(settings.migration_concurrency)
+
+    # Every state comes from the same migration run, so read the clock once
+    now = datetime.now()
+    now_iso = get_current_timestamp()
+    v1_projects_map = {p.id: p for p in v1_projects}
+
+    def _task_state(v1_task: Any, page_id: str) -> Optional[TaskSyncState]:
+        project = v1_projects_map.get(v1_task.project_id)
+        if not project:
+            return None
+        todo = map_task_to_todo(v1_task, project, [], None, now=now_iso)
+        return TaskSyncState(
+            todoist_task_id=v1_task.id,
+            capacities_object_id=page_id,
+            payload_hash=todo.payload_hash(),
+            last_synced_at=now,
+            sync_status=SyncStatus.OK,
+            sync_source="migration",
+        )
+
+    async def _migrate_task(match: Dict[str, Any]) -> Tuple[bool, Optional[TaskSyncState]]:
+        # Update the page (ID and URL in one request), then build its state
+        # while the entry is at hand; the state is kept even if the update fails
+        updated = True
+        try:
+            async with semaphore:
+                await notion.update_todoist_task_id(
+                    match["notion_page_id"], match["new_id"], match["todoist_url"]
+                )
+        except Exception as e:
+            logger.warning("Migration: Failed to update task %s: %s", match['notion_page_id'], e)
+            updated = False
+        try:
+            return updated, _task_state(match["v1_task"], match["notion_page_id"])
+        except Exception as e:
+            logger.warning("Migration: Failed to build state for %s: %s", match['new_id'], e)
+            return updated, None
+
+    async def _migrate_project(
+        proj_match: Dict[str, Any],
+    ) -> Tuple[bool, Optional[ProjectSyncState]]:
+        updated = True
+        try:
+            async with semaphore:
+                await notion.update_todoist_project_id(
+                    proj_match["notion_page_id"], proj_match["new_id"], proj_match["todoist_url"]
+                )
+        except Exception as e:
+            logger.warning(
+                "Migration: Failed to update project %s: %s", proj_match['notion_page_id'], e
+            )
+            updated = False
+        try:
+            notion_proj = map_project_to_notion(proj_match["v1_project"])
+            return updated, ProjectSyncState(
+                todoist_project_id=proj_match["new_id"],
+                capacities_object_id=proj_match["notion_page_id"],
+                payload_hash=notion_proj.payload_hash(),
+                last_synced_at=now,
+            )
+        except Exception as e:
+            logger.warning(
+                "Migration: Failed to build project state for %s: %s", proj_match['new_id'], e
+            )
+            return updated, None
+
+    # Migrate old-ID task pages: Notion update and state build in one pass per task
+    task_results = await asyncio.gather(*(_migrate_task(m) for m in matched_tasks))
+    tasks_updated = sum(1 for updated, _ in task_results if updated)
+    tasks_failed = len(task_results) - tasks_updated
+    matched_states = [state for _, state in task_results if state]
+
+    # Archive duplicate pages
+    dups_archived = 0
+    results = await _gather_bounded(
+        semaphore, (notion.archive_page(d["page_id"]) for d in duplicate_new_pages_to_archive)
+    )
+    for dup, result in zip(duplicate_new_pages_to_archive, results):
+        if isinstance(result, Exception):
+            logger.warning("Migration: Failed to archive duplicate %s: %s", dup['page_id'], result)
+        else:
+            dups_archived += 1
+
+    # Migrate project pages the same way
+    project_results = await asyncio.gather(*(_migrate_project(p) for p in matched_projects))
+    projects_updated = sum(1 for updated, _ in project_results if updated)
+    project_states = [state for _, state in project_results if state]
+
+    # Build states for genuinely new pages (already carry v1 IDs, no Notion write)
+    v1_tasks_map = {t.id: t for t in v1_tasks}
+    new_states = []
+    for entry in genuinely_new_pages:
+        try:
+            v1_task = v1_tasks_map.get(entry["todoist_id"])
+            state = _task_state(v1_task, entry["page_id"]) if v1_task else None
+            if state:
+                new_states.append(state)
+        except Exception as e:
+            logger.warning(
+                "Migration: Failed to build new state for %s: %s", entry['todoist_id'], e
+            )
+
+    # Rebuild Firestore state
+    logger.info("Migration: Clearing old Firestore task states")
+    cleared = await store.clear_all_task_states()
+
+    # Save all states with batched writes
+    # Saved separately so a failed batch is counted against the right group
+    states_saved = 0
+    new_states_saved = 0
+    try:
+        states_saved, new_states_saved = await asyncio.gather(
+            store.save_task_states(matched_states),
+            store.save_task_states(new_states),
+        )
+    except Exception as e:
+        logger.warning("Migration: Failed to save task states: %s", e)
+
+    proj_states_saved = 0
+    try:
+        proj_states_saved = await store.save_project_states(project_states)
+    except Exception as e:
+        logger.warning("Migration: Failed to save project states: %s", e)
+
+    return {
+        "tasks_updated": tasks_updated,
+        "tasks_failed": tasks_failed,
+        "duplicates_archived": dups_archived,
+        "projects_updated": projects_updated,
+        "firestore_cleared": cleared,
+        "task_states_saved": states_saved,
+        "new_task_states_saved": new_states_saved,
+        "project_states_saved": proj_states_saved,
+    }
@@ -2,10 +2,12 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, ClassVar, FrozenSet, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.utils import compute_payload_hash
+
 
 # ============================================================================
 # Todoist Models (API v1)
@@ -127,6 +129,14 @@ class NotionToDo(BaseModel):
     sync_status: str = "ok"  # ok | archived | error
     error_note: Optional[str] = None
 
+    # Stamped on every mapping rather than read from the task, so left out of the hash.
+    # Changing this set changes stored hashes: bump PAYLOAD_HASH_VERSION with it.
+    _HASH_EXCLUDE: ClassVar[FrozenSet[str]] = frozenset({"updated_at", "last_synced_at"})
+
+    def payload_hash(self) -> str:
+        """Hash the synced content for change detection, ignoring sync timestamps."""
+        return compute_payload_hash(self.model_dump(exclude=self._HASH_EXCLUDE))
+
 
 class NotionProject(BaseModel):
     """Notion page for a Project."""
@@ -138,6 +148,12 @@ class NotionProject(BaseModel):
     color: str
     last_synced_at: Optional[str] = None
 
+    _HASH_EXCLUDE: ClassVar[FrozenSet[str]] = frozenset({"last_synced_at"})
+
+    def payload_hash(self) -> str:
+        """Hash the synced content for change detection, ignoring sync timestamps."""
+        return compute_payload_hash(self.model_dump(exclude=self._HASH_EXCLUDE))
+
 
 # ============================================================================
 # Sync State Models (stored in Firestore)
@@ -189,6 +205,9 @@ class SyncAction(str, Enum):
 class PubSubMessage(BaseModel):
     """Pub/Sub message format for sync jobs."""
 
+    # Immutable once built; passing an instance on never re-validates or copies it
+    model_config = ConfigDict(frozen=True, revalidate_instances="never")
+
     action: SyncAction
     todoist_task_id: str
     snapshot: Optional[dict[str, Any]] = None  # Optional task snapshot to avoid re-fetch
@@ -202,7 +221,7 @@ class PubSubMessage(BaseModel):
 class TodoistWebhookEvent(BaseModel):
     """Todoist webhook event payload."""
 
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(extra="ignore", frozen=True, revalidate_instances="never")
 
     event_name: str  # e.g., "item:added", "item:updated", "item:completed"
     event_data: dict[str, Any]
@@ -1,10 +1,18 @@
 """Notion API client for creating and updating pages in databases."""
 
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import httpx
+import orjson
 from notion_client import AsyncClient
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random_exponential,
+)
 
 from app.logging_setup import get_logger
 from app.models import NotionProject, NotionToDo
@@ -13,6 +21,61 @@ from app.settings import settings
 logger = get_logger(__name__)
 
 
+# Property value builders shared by the page create/update methods, so each
+# property's nested scaffolding is defined once instead of inline per call
+def _title_prop(text: str) -> Dict[str, Any]:
+    """Build a title property value."""
+    return {"title": [{"text": {"content": text}}]}
+
+
+def _rich_text_prop(text: str) -> Dict[str, Any]:
+    """Build a rich_text property value."""
+    return {"rich_text": [{"text": {"content": text}}]}
+
+
+def _select_prop(name: str) -> Dict[str, Any]:
+    """Build a select property value."""
+    return {"select": {"name": name}}
+
+
+def _relation_prop(page_ids: Iterable[str]) -> Dict[str, Any]:
+    """Build a relation property value."""
+    return {"relation": [{"id": page_id} for page_id in page_ids]}
+
+
+def _multi_select_prop(names: Iterable[str]) -> Dict[str, Any]:
+    """Build a multi_select property value."""
+    return {"multi_select": [{"name": name} for name in names]}
+
+
+class _PeopleIndex(NamedTuple):
+    """People database pages as parallel per-field lists, precomputed for matching."""
+
+    pages: List[Dict[str, Any]]
+    names: List[str]
+    lowers: List[str]
+    first_tokens: List[str]
+    exact: Dict[str, int]  # lowercased name -> index of the first page with it
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """Check whether an error is a Notion 429 (rate limited) response."""
+    status = getattr(exc, "status", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    return status == 429
+
+
+# Retry policy for bulk writes issued concurrently (e.g. the v1 ID migration):
+# only 429s are retried, with jittered backoff so parallel callers don't retry in step
+_retry_on_rate_limit = retry(
+    retry=retry_if_exception(_is_rate_limited),
+    stop=stop_after_attempt(settings.max_retries),
+    wait=wait_random_exponential(multiplier=settings.retry_delay, max=10),
+    reraise=True,
+)
+
+
 class NotionClient:
     """Async client for Notion API."""
 
@@ -23,6 +86,7 @@ class NotionClient:
         projects_database_id: Optional[str] = None,
         areas_database_id: Optional[str] = None,
         people_database_id: Optional[str] = None,
+        people_cache_ttl: Optional[float] = None,
     ) -> None:
         """
         Initialize Notion client.
@@ -33,6 +97,7 @@ class NotionClient:
             projects_database_id: Notion database ID for projects
             areas_database_id: Notion database ID for PARA areas
             people_database_id: Notion database ID for people
+            people_cache_ttl: Seconds to reuse the People index (defaults to settings)
         """
         self.api_key = api_key or settings.notion_api_key
         self.tasks_db_id = tasks_database_id or settings.notion_tasks_database_id
@@ -40,6 +105,11 @@ class NotionClient:
         self.areas_db_id = areas_database_id or settings.notion_areas_database_id
         self.people_db_id = people_database_id or settings.notion_people_database_id
         self.client = AsyncClient(auth=self.api_key)
+        # Short-lived index of the People database: (fetched_at, index)
+        self._people_ttl = (
+            people_cache_ttl if people_cache_ttl is not None else settings.notion_people_cache_ttl
+        )
+        self._people_cache: Optional[Tuple[float, _PeopleIndex]] = None
         
         # HTTP client for direct API calls (bypassing broken client.databases.query)
         self._http_client = httpx.AsyncClient(
@@ -85,7 +155,7 @@ class NotionClient:
         
         response = await self._http_client.post(url, json=body)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
 
     @retry(
@@ -113,17 +183,17 @@ class NotionClient:
         )
 
         properties = {
-            "Name": {"title": [{"text": {"content": project.name}}]},
-            "Todoist Project ID": {"rich_text": [{"text": {"content": project.todoist_project_id}}]},
+            "Name": _title_prop(project.name),
+            "Todoist Project ID": _rich_text_prop(project.todoist_project_id),
             "Todoist URL": {"url": project.url},
-            "Color": {"select": {"name": project.color}},
+            "Color": _select_prop(project.color),
             "Is Shared": {"checkbox": project.is_shared},
-            "Status": {"select": {"name": "Active"}},
+            "Status": _select_prop("Active"),
         }
         
         # Add AREAS relations if provided (supports multiple areas)
         if area_page_ids:
-            properties["AREAS"] = {"relation": [{"id": aid} for aid in area_page_ids]}
+            properties["AREAS"] = _relation_prop(area_page_ids)
 
         result = await self.client.pages.create(
             parent={"database_id": self.projects_db_id},
@@ -167,16 +237,16 @@ class NotionClient:
         )
 
         properties: Dict[str, Any] = {
-            "Name": {"title": [{"text": {"content": project.name}}]},
+            "Name": _title_prop(project.name),
             "Todoist URL": {"url": project.url},
-            "Color": {"select": {"name": project.color}},
+            "Color": _select_prop(project.color),
             "Is Shared": {"checkbox": project.is_shared},
-            "Status": {"select": {"name": "Active"}},
+            "Status": _select_prop("Active"),
         }
 
         # Only update AREAS if explicitly provided (typically None for post-creation updates)
         if area_page_ids is not None:
-            properties["AREAS"] = {"relation": [{"id": aid} for aid in area_page_ids]}
+            properties["AREAS"] = _relation_prop(area_page_ids)
 
         result = await self.client.pages.update(page_id=page_id, properties=properties)
 
@@ -198,7 +268,7 @@ class NotionClient:
             "Updating Notion project status",
             extra={"page_id": page_id, "status": status},
         )
-        properties = {"Status": {"select": {"name": status}}}
+        properties = {"Status": _select_prop(status)}
         return await self.client.pages.update(page_id=page_id, properties=properties)
 
     @retry(
@@ -231,24 +301,24 @@ class NotionClient:
 
         # Build properties
         properties: Dict[str, Any] = {
-            "Name": {"title": [{"text": {"content": todo.title}}]},
-            "Todoist Task ID": {"rich_text": [{"text": {"content": todo.todoist_task_id}}]},
+            "Name": _title_prop(todo.title),
+            "Todoist Task ID": _rich_text_prop(todo.todoist_task_id),
             "Todoist URL": {"url": todo.todoist_url},
-            "Priority": {"select": {"name": f"P{todo.priority}"}},
+            "Priority": _select_prop(f"P{todo.priority}"),
             "Completed": {"checkbox": todo.completed},
         }
 
         # Add project relation if provided
         if project_page_id:
-            properties["Project"] = {"relation": [{"id": project_page_id}]}
+            properties["Project"] = _relation_prop([project_page_id])
 
         # Add AREAS relations if provided (PARA method - supports multiple areas)
         if area_page_ids:
-            properties["AREAS"] = {"relation": [{"id": aid} for aid in area_page_ids]}
+            properties["AREAS"] = _relation_prop(area_page_ids)
 
         # Add People relations if provided
         if people_page_ids:
-            properties["People"] = {"relation": [{"id": pid} for pid in people_page_ids]}
+            properties["People"] = _relation_prop(people_page_ids)
 
         # Add due date if present
         if todo.due_date:
@@ -256,17 +326,17 @@ class NotionClient:
 
         # Add labels as multi-select
         if todo.todoist_labels:
-            properties["Labels"] = {"multi_select": [{"name": label} for label in todo.todoist_labels]}
-
-        # Create the page
-        result = await self.client.pages.create(
-            parent={"database_id": self.tasks_db_id},
-            properties=properties,
-        )
+            properties["Labels"] = _multi_select_prop(todo.todoist_labels)
 
-        # Add body content if present
-        if todo.body or todo.comments_markdown:
-            await self._add_page_content(result["id"], todo.body, todo.comments_markdown)
+        # Create the page with its body content in the same request
+        create_args: Dict[str, Any] = {
+            "parent": {"database_id": self.tasks_db_id},
+            "properties": properties,
+        }
+        blocks = self._page_content_blocks(todo.body, todo.comments_markdown)
+        if blocks:
+            create_args["children"] = blocks
+        result = await self.client.pages.create(**create_args)
 
         logger.info(
             "Todo page created",
@@ -275,19 +345,17 @@ class NotionClient:
 
         return result
 
-    async def _add_page_content(
-        self,
-        page_id: str,
-        description: str,
-        comments: str,
-    ) -> None:
+    @staticmethod
+    def _page_content_blocks(description: str, comments: str) -> List[Dict[str, Any]]:
         """
-        Add content blocks to a Notion page.
+        Build the body blocks for a todo page.
 
         Args:
-            page_id: Notion page ID
             description: Task description
             comments: Comments markdown
+
+        Returns:
+            Paragraph/heading blocks (empty when there is no content)
         """
         blocks = []
 
@@ -318,8 +386,7 @@ class NotionClient:
                 },
             })
 
-        if blocks:
-            await self.client.blocks.children.append(block_id=page_id, children=blocks)
+        return blocks
 
     @retry(
         stop=stop_after_attempt(settings.max_retries),
@@ -352,8 +419,8 @@ class NotionClient:
         )
 
         properties: Dict[str, Any] = {
-            "Name": {"title": [{"text": {"content": todo.title}}]},
-            "Priority": {"select": {"name": f"P{todo.priority}"}},
+            "Name": _title_prop(todo.title),
+            "Priority": _select_prop(f"P{todo.priority}"),
             "Completed": {"checkbox": todo.completed},
         }
 
@@ -363,19 +430,19 @@ class NotionClient:
 
         # Update labels
         if todo.todoist_labels:
-            properties["Labels"] = {"multi_select": [{"name": label} for label in todo.todoist_labels]}
+            properties["Labels"] = _multi_select_prop(todo.todoist_labels)
 
         # Update AREAS relations if provided (supports multiple areas)
         if area_page_ids:
-            properties["AREAS"] = {"relation": [{"id": aid} for aid in area_page_ids]}
+            properties["AREAS"] = _relation_prop(area_page_ids)
 
         # Update People relations if provided
         if people_page_ids:
-            properties["People"] = {"relation": [{"id": pid} for pid in people_page_ids]}
+            properties["People"] = _relation_prop(people_page_ids)
 
         # Update Project relation if provided (task moved projects)
         if project_page_id:
-            properties["Project"] = {"relation": [{"id": project_page_id}]}
+            properties["Project"] = _relation_prop([project_page_id])
 
         # Automatically unarchive page if it was archived (prevents "can't edit archived block" errors)
         result = await self.client.pages.update(
@@ -463,6 +530,7 @@ class NotionClient:
             )
             return None
 
+    @_retry_on_rate_limit
     async def archive_page(self, page_id: str) -> Dict[str, Any]:
         """
         Archive a Notion page (mark as completed and archived).
@@ -538,7 +606,7 @@ class NotionClient:
         logger.info("Creating area page", extra={"area_name": area_name})
 
         properties = {
-            "Name": {"title": [{"text": {"content": area_name}}]},
+            "Name": _title_prop(area_name),
         }
 
         result = await self.client.pages.create(
@@ -586,113 +654,147 @@ class NotionClient:
         )
         return None
 
-    async def find_person_by_name(self, person_name: str) -> Optional[Dict[str, Any]]:
+    async def _load_people_index(self) -> _PeopleIndex:
         """
-        Find a person page by name in the People database.
-        
+        Fetch the People database once and index it for name matching.
+
+        The index is reused for ``people_cache_ttl`` seconds, so labels across
+        a batch of tasks resolve without re-paginating the database.
+
+        Returns:
+            People index
+        """
+        if self._people_cache is not None:
+            fetched_at, index = self._people_cache
+            if time.monotonic() - fetched_at < self._people_ttl:
+                return index
+
+        # Use direct HTTP call instead of broken client.databases.query()
+        results = []
+        has_more = True
+        start_cursor = None
+
+        while has_more:
+            query_params = {"page_size": 100}
+            if start_cursor:
+                query_params["start_cursor"] = start_cursor
+
+            response = await self._query_database_direct(
+                database_id=self.people_db_id,
+                **query_params
+            )
+            results.extend(response.get("results", []))
+
+            has_more = response.get("has_more", False)
+            start_cursor = response.get("next_cursor")
+
+        index = _PeopleIndex(pages=[], names=[], lowers=[], first_tokens=[], exact={})
+        for page in results:
+            title = page.get("properties", {}).get("Name", {}).get("title")
+            if not title:
+                continue
+            name = title[0]["text"]["content"]
+            lower = name.lower()
+            tokens = lower.split()
+            # A blank name would fuzzy-match every label
+            if not tokens:
+                continue
+            index.exact.setdefault(lower, len(index.pages))
+            index.pages.append(page)
+            index.names.append(name)
+            index.lowers.append(lower)
+            index.first_tokens.append(tokens[0])
+
+        logger.info("Fetched all people from database", extra={"total_people": len(index.pages)})
+
+        if self._people_ttl > 0:
+            self._people_cache = (time.monotonic(), index)
+        return index
+
+    @staticmethod
+    def _match_person(index: _PeopleIndex, person_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a label to a person page using a People index.
+
         Uses fuzzy matching to handle variations like:
         - "DougD" matches "Doug Diego"
         - "VarshaA" matches "Varsha"
-        
+
+        Args:
+            index: People index from _load_people_index()
+            person_name: Person name from Todoist label
+
+        Returns:
+            Person page dict if found, None otherwise
+        """
+        label_lower = person_name.lower()
+
+        # Exact match (case-insensitive) first
+        i = index.exact.get(label_lower)
+        if i is not None:
+            logger.info(
+                "Found person (exact match)",
+                extra={
+                    "label": person_name,
+                    "notion_name": index.names[i],
+                    "page_id": index.pages[i]["id"],
+                },
+            )
+            return index.pages[i]
+
+        # Fuzzy match: label contained in or containing the page name, or sharing its start
+        for i, name_lower in enumerate(index.lowers):
+            if (label_lower in name_lower or name_lower in label_lower or
+                    label_lower.startswith(index.first_tokens[i]) or
+                    name_lower.startswith(label_lower)):
+                logger.info(
+                    "Found person (fuzzy match)",
+                    extra={
+                        "label": person_name,
+                        "notion_name": index.names[i],
+                        "page_id": index.pages[i]["id"],
+                    },
+                )
+                return index.pages[i]
+
+        logger.info("No matching person found", extra={"person_name": person_name})
+        return None
+
+    async def find_person_by_name(self, person_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a person page by name in the People database.
+
         Args:
             person_name: Person name from Todoist label (e.g., "DougD", "VarshaA")
-            
+
         Returns:
             Person page dict if found, None otherwise
         """
         if not self.people_db_id:
             return None
-            
-        logger.info(
-            "Searching for person in People database",
-            extra={"person_name": person_name},
-        )
-        
+
         try:
-            # Query all people with pagination (we'll do fuzzy matching client-side)
-            # Use direct HTTP call instead of broken client.databases.query()
-            results = []
-            has_more = True
-            start_cursor = None
-            
-            while has_more:
-                query_params = {}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                query_params["page_size"] = 100
-                    
-                response = await self._query_database_direct(
-                    database_id=self.people_db_id,
-                    **query_params
-                )
-                results.extend(response.get("results", []))
-                
-                has_more = response.get("has_more", False)
-                start_cursor = response.get("next_cursor")
-            
-            logger.info(
-                "Fetched all people from database",
-                extra={"person_name": person_name, "total_people": len(results)},
-            )
-            
-            # Try exact match first
-            for page in results:
-                title_prop = page.get("properties", {}).get("Name", {})
-                if title_prop and "title" in title_prop and title_prop["title"]:
-                    page_name = title_prop["title"][0]["text"]["content"]
-                    
-                    # Exact match (case-insensitive)
-                    if page_name.lower() == person_name.lower():
-                        logger.info(
-                            "Found person (exact match)",
-                            extra={"label": person_name, "notion_name": page_name, "page_id": page["id"]},
-                        )
-                        return page
-            
-            # Try fuzzy matching - check if label is contained in or contains the page name
-            for page in results:
-                title_prop = page.get("properties", {}).get("Name", {})
-                if title_prop and "title" in title_prop and title_prop["title"]:
-                    page_name = title_prop["title"][0]["text"]["content"]
-                    
-                    # Fuzzy match: "DougD" matches "Doug Diego"
-                    label_lower = person_name.lower()
-                    name_lower = page_name.lower()
-                    
-                    # Check if label starts with page name or vice versa
-                    if (label_lower in name_lower or name_lower in label_lower or
-                        label_lower.startswith(name_lower.split()[0]) or
-                        name_lower.startswith(label_lower)):
-                        logger.info(
-                            "Found person (fuzzy match)",
-                            extra={"label": person_name, "notion_name": page_name, "page_id": page["id"]},
-                        )
-                        return page
-            
-            logger.info(
-                "No matching person found",
-                extra={"person_name": person_name},
-            )
-            return None
+            index = await self._load_people_index()
         except Exception as e:
             logger.warning(
                 "Error finding person by name",
                 extra={"person_name": person_name, "error": str(e)},
             )
             return None
+        return self._match_person(index, person_name)
 
-    async def get_all_task_pages(self) -> List[Dict[str, Any]]:
+    async def iter_task_pages(self) -> AsyncIterator[Dict[str, Any]]:
         """
-        Fetch all task pages from the Notion tasks database.
+        Stream task pages from the Notion tasks database.
 
-        Auto-paginates through all pages.
+        Auto-paginates, holding one batch of pages in memory at a time.
 
-        Returns:
-            List of all page objects
+        Yields:
+            Page objects in query order
         """
         logger.info("Fetching all task pages from Notion")
 
-        all_pages = []
+        total = 0
         has_more = True
         start_cursor = None
 
@@ -706,17 +808,31 @@ class NotionClient:
                 **query_params
             )
 
-            all_pages.extend(response.get("results", []))
+            results = response.get("results", [])
+            total += len(results)
             has_more = response.get("has_more", False)
             start_cursor = response.get("next_cursor")
 
             logger.info(
                 "Fetched task pages batch",
-                extra={"batch_size": len(response.get("results", [])), "total": len(all_pages)},
+                extra={"batch_size": len(results), "total": total},
             )
 
-        logger.info("Fetched all task pages", extra={"total": len(all_pages)})
-        return all_pages
+            for page in results:
+                yield page
+
+        logger.info("Fetched all task pages", extra={"total": total})
+
+    async def get_all_task_pages(self) -> List[Dict[str, Any]]:
+        """
+        Fetch all task pages from the Notion tasks database.
+
+        Auto-paginates through all pages.
+
+        Returns:
+            List of all page objects
+        """
+        return [page async for page in self.iter_task_pages()]
 
     async def get_all_project_pages(self) -> List[Dict[str, Any]]:
         """
@@ -748,13 +864,20 @@ class NotionClient:
         logger.info("Fetched all project pages", extra={"total": len(all_pages)})
         return all_pages
 
-    async def update_todoist_task_id(self, page_id: str, new_task_id: str) -> Dict[str, Any]:
+    @_retry_on_rate_limit
+    async def update_todoist_task_id(
+        self,
+        page_id: str,
+        new_task_id: str,
+        todoist_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Update the Todoist Task ID property on a Notion page.
 
         Args:
             page_id: Notion page ID
             new_task_id: New v1 Todoist task ID
+            todoist_url: New Todoist URL, set in the same request when given
 
         Returns:
             Updated page data
@@ -764,20 +887,28 @@ class NotionClient:
             extra={"page_id": page_id, "new_task_id": new_task_id},
         )
 
-        return await self.client.pages.update(
-            page_id=page_id,
-            properties={
-                "Todoist Task ID": {"rich_text": [{"text": {"content": new_task_id}}]},
-            },
-        )
+        properties: Dict[str, Any] = {
+            "Todoist Task ID": _rich_text_prop(new_task_id),
+        }
+        if todoist_url is not None:
+            properties["Todoist URL"] = {"url": todoist_url}
+
+        return await self.client.pages.update(page_id=page_id, properties=properties)
 
-    async def update_todoist_project_id(self, page_id: str, new_project_id: str) -> Dict[str, Any]:
+    @_retry_on_rate_limit
+    async def update_todoist_project_id(
+        self,
+        page_id: str,
+        new_project_id: str,
+        todoist_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Update the Todoist Project ID property on a Notion project page.
 
         Args:
             page_id: Notion page ID
             new_project_id: New v1 Todoist project ID
+            todoist_url: New Todoist URL, set in the same request when given
 
         Returns:
             Updated page data
@@ -787,12 +918,13 @@ class NotionClient:
             extra={"page_id": page_id, "new_project_id": new_project_id},
         )
 
-        return await self.client.pages.update(
-            page_id=page_id,
-            properties={
-                "Todoist Project ID": {"rich_text": [{"text": {"content": new_project_id}}]},
-            },
-        )
+        properties: Dict[str, Any] = {
+            "Todoist Project ID": _rich_text_prop(new_project_id),
+        }
+        if todoist_url is not None:
+            properties["Todoist URL"] = {"url": todoist_url}
+
+        return await self.client.pages.update(page_id=page_id, properties=properties)
 
     async def match_people(self, person_names: List[str]) -> List[str]:
         """
@@ -807,9 +939,19 @@ class NotionClient:
         if not self.people_db_id or not person_names:
             return []
 
+        # One People fetch (or cache hit) resolves every label
+        try:
+            index = await self._load_people_index()
+        except Exception as e:
+            logger.warning(
+                "Error loading People database",
+                extra={"person_names": person_names, "error": str(e)},
+            )
+            return []
+
         matched_page_ids = []
         for person_name in person_names:
-            person_page = await self.find_person_by_name(person_name)
+            person_page = self._match_person(index, person_name)
             if person_page:
                 matched_page_ids.append(person_page["id"])
 
@@ -923,7 +1065,7 @@ class NotionClient:
         return await self.client.pages.update(
             page_id=page_id,
             properties={
-                "Todoist Task ID": {"rich_text": [{"text": {"content": task_id}}]},
+                "Todoist Task ID": _rich_text_prop(task_id),
                 "Todoist URL": {"url": task_url},
             },
         )
@@ -0,0 +1,226 @@
+"""Verification of Google-signed OIDC tokens (Cloud Scheduler -> /reconcile)."""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import orjson
+from google.auth import exceptions as google_auth_exceptions
+from google.auth import jwt
+
+from app.logging_setup import get_logger
+from app.settings import settings
+
+logger = get_logger(__name__)
+
+# Google's signing certificates as a {kid: PEM certificate} mapping
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = frozenset({"accounts.google.com", "https://accounts.google.com"})
+
+# Minimum seconds between certificate fetches triggered by unknown key IDs
+_MIN_REFRESH_INTERVAL = 60.0
+
+# Verified-token cache size above which expired entries are swept
+_VERIFIED_SWEEP_THRESHOLD = 256
+
+
+class GoogleCertCache:
+    """
+    Cache of Google's OIDC signing certificates, keyed by kid.
+
+    Certificates are fetched once and reused until the TTL expires or a token
+    arrives with a kid that isn't cached. The previous certificate set is kept
+    for one refresh so tokens signed just before a key rotation still verify
+    without another fetch. Claims of tokens that passed verification are also
+    kept until the token expires, so a replayed token skips the RSA check.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Initialize the certificate cache.
+
+        Args:
+            ttl: Seconds to reuse a fetched certificate set (defaults to settings)
+            http_client: Client used to fetch certificates. When given, the caller
+                owns it; otherwise a pooled client is created on first fetch and
+                kept open until close(), so refreshes reuse the connection.
+        """
+        self.ttl = settings.oidc_certs_cache_ttl if ttl is None else ttl
+        self._http_client = http_client
+        self._owns_client = http_client is None
+        self._current: Dict[str, str] = {}
+        self._previous: Dict[str, str] = {}
+        self._fetched_at = 0.0
+        self._expires_at = 0.0
+        # (sha256(token), audience) -> verified claims
+        self._verified: Dict[Tuple[bytes, str], Dict[str, Any]] = {}
+        # Created on first refresh so it binds to the running event loop (Python 3.9)
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    def _lookup(self, kid: str) -> Optional[str]:
+        """Return the cached certificate for ``kid`` from the current or previous set."""
+        return self._current.get(kid) or self._previous.get(kid)
+
+    async def _fetch(self) -> Dict[str, str]:
+        """Download Google's current signing certificates."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                timeout=settings.request_timeout,
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+        response = await self._http_client.get(GOOGLE_CERTS_URL)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def close(self) -> None:
+        """Close the HTTP client if this cache created it."""
+        if self._http_client is not None and self._owns_client:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def get_verified(self, key: Tuple[bytes, str]) -> Optional[Dict[str, Any]]:
+        """
+        Get the claims of a previously verified token that hasn't expired yet.
+
+        Args:
+            key: Token digest and audience, as built by verify_oidc_token
+
+        Returns:
+            Verified claims, or None if the token isn't cached or has expired
+        """
+        claims = self._verified.get(key)
+        if claims is None:
+            return None
+        if claims.get("exp", 0) <= time.time():
+            del self._verified[key]
+            return None
+        return claims
+
+    def remember_verified(self, key: Tuple[bytes, str], claims: Dict[str, Any]) -> None:
+        """
+        Cache the claims of a token that passed verification.
+
+        Args:
+            key: Token digest and audience, as built by verify_oidc_token
+            claims: Verified claims (must include ``exp``)
+        """
+        if len(self._verified) >= _VERIFIED_SWEEP_THRESHOLD:
+            now = time.time()
+            self._verified = {
+                k: c for k, c in self._verified.items() if c.get("exp", 0) > now
+            }
+        self._verified[key] = claims
+
+    async def get_certs(self, kid: str) -> Dict[str, str]:
+        """
+        Get the certificate for a key ID, refreshing the cache on a miss.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            Mapping of kid to PEM certificate (empty if Google doesn't know the kid)
+
+        Raises:
+            httpx.HTTPError: If the certificates cannot be fetched
+        """
+        if time.monotonic() < self._expires_at:
+            cert = self._lookup(kid)
+            if cert is not None:
+                return {kid: cert}
+
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            # Another request may have refreshed while we waited
+            now = time.monotonic()
+            fresh = now < self._expires_at
+            cert = self._lookup(kid)
+            if fresh and cert is not None:
+                return {kid: cert}
+            # Unknown kids on a fresh set don't trigger more than one fetch per interval
+            if fresh and now - self._fetched_at < _MIN_REFRESH_INTERVAL:
+                return {}
+
+            fetched = await self._fetch()
+            if fetched != self._current:
+                self._previous = self._current
+                self._current = fetched
+            self._fetched_at = time.monotonic()
+            self._expires_at = self._fetched_at + self.ttl
+            logger.info("Refreshed Google OIDC certificates", extra={"kids": list(fetched)})
+
+            cert = self._lookup(kid)
+
+        return {kid: cert} if cert is not None else {}
+
+
+async def verify_oidc_token(
+    token: str,
+    audience: str,
+    cert_cache: GoogleCertCache,
+) -> Optional[Dict[str, Any]]:
+    """
+    Verify a Google-signed OIDC ID token.
+
+    Checks the signature against Google's certificates, the expiry, audience and
+    issuer, and the verified service account that minted the token. Tokens are
+    rejected outright when no service account is configured.
+    Certificates come from the async cache and the signature check runs in a
+    worker thread, so the event loop is never blocked. A token already verified
+    for the same audience is answered from the cache until it expires.
+
+    Args:
+        token: Raw JWT (without the "Bearer " prefix)
+        audience: Expected ``aud`` claim
+        cert_cache: Certificate cache shared across requests
+
+    Returns:
+        Verified claims, or None if the token is invalid
+    """
+    cache_key = (hashlib.sha256(token.encode("utf-8")).digest(), audience)
+    cached = cert_cache.get_verified(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        header = jwt.decode_header(token)
+        kid = header.get("kid")
+        if not kid:
+            logger.warning("OIDC token has no key ID")
+            return None
+
+        certs = await cert_cache.get_certs(kid)
+        if not certs:
+            logger.warning("OIDC token signed with unknown key", extra={"kid": kid})
+            return None
+
+        # RSA signature check is CPU-bound; keep it off the event loop
+        claims = await asyncio.to_thread(jwt.decode, token, certs=certs, audience=audience)
+    except httpx.HTTPError:
+        logger.error("Failed to fetch Google OIDC certificates", exc_info=True)
+        return None
+    except (ValueError, google_auth_exceptions.GoogleAuthError) as e:
+        logger.warning("OIDC token verification failed", extra={"error": str(e)})
+        return None
+
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        logger.warning("OIDC token has unexpected issuer", extra={"issuer": claims.get("iss")})
+        return None
+
+    expected_email = settings.oidc_service_account_email
+    if not expected_email:
+        logger.error("OIDC service account email not configured; rejecting token")
+        return None
+    if claims.get("email") != expected_email or not claims.get("email_verified"):
+        logger.warning("OIDC token from unexpected principal", extra={"email": claims.get("email")})
+        return None
+
+    cert_cache.remember_verified(cache_key, claims)
+    return claims
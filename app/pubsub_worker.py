@@ -6,12 +6,25 @@ from typing import Optional
 from app.notion_client import NotionClient
 from app.logging_setup import get_logger
 from app.mapper import create_archived_todo, map_project_to_notion, map_task_to_todo
-from app.models import PubSubMessage, SyncAction, SyncStatus, TaskSyncState, TodoistTask
+from app.models import (
+    ProjectSyncState,
+    PubSubMessage,
+    SyncAction,
+    SyncStatus,
+    TaskSyncState,
+    TodoistTask,
+)
 from app.reverse_mapper import compute_notion_properties_hash
 from app.settings import settings
 from app.store import FirestoreStore
 from app.todoist_client import TodoistClient
-from app.utils import compute_payload_hash, extract_para_area, extract_para_areas, extract_person_labels, has_capsync_label
+from app.utils import (
+    extract_para_area,
+    extract_para_areas,
+    extract_person_labels,
+    get_area_label_from_parent_project,
+    has_capsync_label,
+)
 from typing import List
 
 logger = get_logger(__name__)
@@ -88,7 +101,7 @@ class SyncWorker:
         if message.snapshot:
             logger.info("Using task snapshot from message")
             try:
-                task = TodoistTask(**message.snapshot)
+                task = TodoistTask.model_validate(message.snapshot)
             except Exception as e:
                 logger.warning(
                     "Could not parse task snapshot, falling back to API fetch",
@@ -124,8 +137,6 @@ class SyncWorker:
         # NEW TASK: Inherit Area label from parent project if not already present
         # This runs for new tasks (no existing_state) to auto-assign Area labels
         if not existing_state and sync_source == "webhook":
-            from app.utils import get_area_label_from_parent_project
-            
             # Check if task already has an Area label
             current_area = extract_para_area(task.labels)
             
@@ -182,7 +193,7 @@ class SyncWorker:
         notion_project = map_project_to_notion(project)
 
         # Compute payload hash for idempotency
-        payload_hash = compute_payload_hash(todo.model_dump())
+        payload_hash = todo.payload_hash()
 
         # Skip if unchanged (idempotency check)
         # NOTE: We use the existing_state fetched at line 103, not a fresh fetch
@@ -424,12 +435,10 @@ class SyncWorker:
             notion_page_id = result.get("id")
 
         # Save state
-        from app.models import ProjectSyncState
-
         state = ProjectSyncState(
             todoist_project_id=project_id,
             capacities_object_id=notion_page_id,  # Using same field name for compatibility
-            payload_hash=compute_payload_hash(project.model_dump()),
+            payload_hash=project.payload_hash(),
             last_synced_at=datetime.now(),
         )
         await self.store.save_project_state(state)
@@ -21,6 +21,14 @@ class Settings(BaseSettings):
     # Pub/Sub Configuration
     pubsub_topic: str = "todoist-sync-jobs"
     pubsub_subscription: str = "todoist-sync-worker"
+    pubsub_batch_max_messages: int = 100  # Publish once this many messages are buffered
+    pubsub_batch_max_bytes: int = 1024 * 1024  # ...or once the batch reaches this size
+    pubsub_batch_max_latency: float = 0.05  # ...or after this many seconds
+    webhook_publish_queue_size: int = 10_000  # Webhooks awaiting publish; each acked once sent
+
+    # Runtime
+    environment: str = "production"  # "local" enables auto-reload when run via python -m app.main
+    uvicorn_workers: int = 1  # Worker processes when run via python -m app.main outside local
 
     # Logging
     log_level: str = "INFO"
@@ -30,6 +38,11 @@ class Settings(BaseSettings):
     notion_api_key: str
     internal_cron_token: str = "dev-token-change-in-production"
 
+    # Cloud Scheduler OIDC verification
+    oidc_audience: str = ""  # Required for OIDC; audience Cloud Scheduler mints tokens for
+    oidc_service_account_email: str = ""  # Required for OIDC; only this account is accepted
+    oidc_certs_cache_ttl: float = 6 * 60 * 60  # Seconds to reuse Google's signing certificates
+
     # Notion Configuration
     notion_tasks_database_id: str
     notion_projects_database_id: str
@@ -44,10 +57,23 @@ class Settings(BaseSettings):
     max_retries: int = 3
     retry_delay: float = 1.0
     request_timeout: int = 30
+    migration_concurrency: int = 3  # Notion writes in flight at once during the v1 ID migration
+
+    # Reconciliation
+    reconcile_claim_ttl: float = 60 * 60  # Seconds before an unfinished run's claim is abandoned
+    reconcile_concurrency: int = 4  # Tasks synced at once (tasks in the same project run in order)
+
+    # Caching
+    todoist_projects_cache_ttl: float = 30.0  # Seconds to reuse get_projects() results (0 disables)
+    notion_people_cache_ttl: float = 5 * 60  # Seconds to reuse the People index (0 disables)
 
     # Todoist Webhook Configuration
     todoist_client_secret: str = ""  # For HMAC webhook verification (from Todoist App Console)
 
+    # Request body limits (bytes)
+    webhook_max_body_bytes: int = 256 * 1024
+    pubsub_max_body_bytes: int = 64 * 1024
+
     # Feature flags
     add_notion_backlink: bool = True  # Add Notion page link to Todoist task description
     enable_para_areas: bool = True  # Enable PARA method area mapping
@@ -55,6 +81,7 @@ class Settings(BaseSettings):
     auto_label_tasks: bool = True  # Auto-add capsync label to eligible tasks (not in Inbox, not recurring)
     enable_notion_to_todoist: bool = True  # Enable bidirectional Notion→Todoist sync
     enable_notion_task_creation: bool = True  # Enable creating Todoist tasks from Notion
+    expose_error_details: bool = False  # Include exception messages in API error responses
     
     # PARA Method Configuration
     para_area_labels: list[str] = [
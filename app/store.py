@@ -1,7 +1,9 @@
 """Firestore operations for storing sync state."""
 
+import asyncio
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from google.cloud import firestore
 from google.cloud.firestore_v1 import AsyncClient
@@ -12,21 +14,35 @@ from app.settings import settings
 
 logger = get_logger(__name__)
 
+# Batched writes: many small batches committed concurrently (BulkWriter-style) finish
+# sooner than a few large ones committed in turn (Firestore allows up to 500 per batch)
+_BATCH_WRITE_SIZE = 50
+_MAX_CONCURRENT_COMMITS = 10
+
 
 class FirestoreStore:
     """Async Firestore client for sync state management."""
 
-    def __init__(self, project_id: Optional[str] = None, namespace: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        client: Optional[AsyncClient] = None,
+    ) -> None:
         """
         Initialize Firestore client.
 
         Args:
             project_id: GCP project ID (defaults to settings)
             namespace: Firestore namespace/collection prefix (defaults to settings)
+            client: Shared AsyncClient to use for all collections. When given, the
+                caller owns it and close() leaves it alone; otherwise one is created
+                lazily on first use.
         """
         self.project_id = project_id or settings.gcp_project_id
         self.namespace = namespace or settings.firestore_namespace
-        self.client: Optional[AsyncClient] = None
+        self.client: Optional[AsyncClient] = client
+        self._owns_client = client is None
 
     async def _get_client(self) -> AsyncClient:
         """Get or create async Firestore client."""
@@ -42,6 +58,10 @@ class FirestoreStore:
         """Get project collection reference."""
         return f"{self.namespace}_projects"
 
+    def _reconcile_run_collection_ref(self) -> str:
+        """Get reconcile run collection reference."""
+        return f"{self.namespace}_reconcile_runs"
+
     async def get_task_state(self, todoist_task_id: str) -> Optional[TaskSyncState]:
         """
         Retrieve task sync state from Firestore.
@@ -137,6 +157,94 @@ class FirestoreStore:
 
         await doc_ref.set(data)
 
+    async def _set_documents(
+        self, collection: str, documents: List[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """
+        Write documents with batched commits instead of one RPC per document.
+
+        Batches are committed concurrently, bounded by _MAX_CONCURRENT_COMMITS.
+        A failed batch is logged and skipped, so the other batches still land.
+
+        Args:
+            collection: Collection name
+            documents: (document ID, data) pairs to set
+
+        Returns:
+            Number of documents committed (excludes failed batches)
+        """
+        client = await self._get_client()
+        collection_ref = client.collection(collection)
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_COMMITS)
+
+        async def _commit(chunk: List[Tuple[str, Dict[str, Any]]]) -> int:
+            async with semaphore:
+                batch = client.batch()
+                for doc_id, data in chunk:
+                    batch.set(collection_ref.document(doc_id), data)
+                await batch.commit()
+            return len(chunk)
+
+        results = await asyncio.gather(
+            *(
+                _commit(documents[start:start + _BATCH_WRITE_SIZE])
+                for start in range(0, len(documents), _BATCH_WRITE_SIZE)
+            ),
+            return_exceptions=True,
+        )
+
+        committed = 0
+        for start, result in zip(range(0, len(documents), _BATCH_WRITE_SIZE), results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Batch write failed",
+                    extra={
+                        "collection": collection,
+                        "first_doc_id": documents[start][0],
+                        "doc_count": len(documents[start:start + _BATCH_WRITE_SIZE]),
+                        "error": str(result),
+                    },
+                )
+            else:
+                committed += result
+
+        return committed
+
+    async def save_task_states(self, states: List[TaskSyncState]) -> int:
+        """
+        Save many task sync states using batched writes.
+
+        Args:
+            states: TaskSyncStates to save
+
+        Returns:
+            Number of states committed (failed batches are logged and skipped)
+        """
+        logger.info("Saving task states in batches", extra={"count": len(states)})
+
+        # model_dump keeps last_synced_at as a datetime, as in save_task_state
+        return await self._set_documents(
+            self._task_collection_ref(),
+            [(state.todoist_task_id, state.model_dump()) for state in states],
+        )
+
+    async def save_project_states(self, states: List[ProjectSyncState]) -> int:
+        """
+        Save many project sync states using batched writes.
+
+        Args:
+            states: ProjectSyncStates to save
+
+        Returns:
+            Number of states committed (failed batches are logged and skipped)
+        """
+        logger.info("Saving project states in batches", extra={"count": len(states)})
+
+        return await self._set_documents(
+            self._project_collection_ref(),
+            [(state.todoist_project_id, state.model_dump()) for state in states],
+        )
+
     async def get_all_task_states(self) -> List[TaskSyncState]:
         """
         Retrieve all task sync states.
@@ -219,7 +327,7 @@ class FirestoreStore:
             await doc.reference.delete()
             count += 1
         
-        logger.info(f"Cleared {count} task states")
+        logger.info("Cleared %s task states", count)
         return count
     
     async def get_last_reconcile_time(self) -> Optional[str]:
@@ -250,6 +358,128 @@ class FirestoreStore:
         doc_ref = client.collection(self.namespace).document("_meta")
         await doc_ref.set({"last_reconcile_time": timestamp}, merge=True)
 
+    async def get_last_reconcile_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary recorded by the most recent background reconciliation.
+
+        Returns:
+            Summary dictionary, or None if no run has been recorded
+        """
+        client = await self._get_client()
+        doc_ref = client.collection(self.namespace).document("_meta")
+        doc = await doc_ref.get()
+
+        if doc.exists:
+            data = doc.to_dict()
+            return data.get("last_reconcile_summary")
+
+        return None
+
+    async def set_last_reconcile_summary(self, summary: Dict[str, Any]) -> None:
+        """
+        Record the summary of a background reconciliation run.
+
+        Args:
+            summary: Reconciliation summary dictionary
+        """
+        client = await self._get_client()
+        doc_ref = client.collection(self.namespace).document("_meta")
+        await doc_ref.set({"last_reconcile_summary": summary}, merge=True)
+
+    async def claim_reconcile_run(self, run_id: str, started_at: str, stale_after: float) -> bool:
+        """
+        Atomically mark a reconciliation as in progress and create its run record.
+
+        The in-progress flag lives on the ``_meta`` document and is checked and
+        set in one transaction, so concurrent triggers (Cloud Scheduler retries,
+        several instances) start at most one run. A flag older than
+        ``stale_after`` seconds is treated as left behind by a crashed instance.
+
+        Args:
+            run_id: ID of the run to start
+            started_at: ISO 8601 start timestamp
+            stale_after: Seconds after which an existing claim can be taken over
+
+        Returns:
+            True if the claim was taken, False if another run is in progress
+        """
+        client = await self._get_client()
+        meta_ref = client.collection(self.namespace).document("_meta")
+        run_ref = client.collection(self._reconcile_run_collection_ref()).document(run_id)
+
+        @firestore.async_transactional
+        async def _claim(transaction: Any) -> bool:
+            snapshot = await meta_ref.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            current = data.get("reconcile_in_progress")
+            now = time.time()
+            if current and now - current.get("claimed_at", 0) < stale_after:
+                return False
+
+            transaction.set(
+                meta_ref,
+                {"reconcile_in_progress": {"run_id": run_id, "claimed_at": now}},
+                merge=True,
+            )
+            transaction.set(
+                run_ref, {"run_id": run_id, "status": "running", "started_at": started_at}
+            )
+            return True
+
+        claimed = await _claim(client.transaction())
+        logger.info("Reconcile run claim", extra={"run_id": run_id, "claimed": claimed})
+        return claimed
+
+    async def release_reconcile_run(self, run_id: str) -> None:
+        """
+        Clear the in-progress flag if it still belongs to the given run.
+
+        Args:
+            run_id: ID of the run that finished
+        """
+        client = await self._get_client()
+        meta_ref = client.collection(self.namespace).document("_meta")
+
+        @firestore.async_transactional
+        async def _release(transaction: Any) -> None:
+            snapshot = await meta_ref.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            current = data.get("reconcile_in_progress")
+            if current and current.get("run_id") == run_id:
+                transaction.update(meta_ref, {"reconcile_in_progress": firestore.DELETE_FIELD})
+
+        await _release(client.transaction())
+
+    async def get_reconcile_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the record of a reconciliation run.
+
+        Args:
+            run_id: Run ID returned by POST /reconcile
+
+        Returns:
+            Run record (status, timing and summary), or None if unknown
+        """
+        client = await self._get_client()
+        doc = await client.collection(self._reconcile_run_collection_ref()).document(run_id).get()
+
+        if doc.exists:
+            return doc.to_dict()
+
+        return None
+
+    async def save_reconcile_run(self, run_id: str, record: Dict[str, Any]) -> None:
+        """
+        Update the record of a reconciliation run.
+
+        Args:
+            run_id: Run ID
+            record: Fields to merge into the run record
+        """
+        client = await self._get_client()
+        doc_ref = client.collection(self._reconcile_run_collection_ref()).document(run_id)
+        await doc_ref.set(record, merge=True)
+
     async def get_task_state_by_notion_id(self, notion_page_id: str) -> Optional[TaskSyncState]:
         """
         Find a task state by Notion page ID.
@@ -293,8 +523,8 @@ class FirestoreStore:
         return states
 
     async def close(self) -> None:
-        """Close Firestore client connection."""
-        if self.client:
+        """Close Firestore client connection (a shared client is left open)."""
+        if self.client and self._owns_client:
             # AsyncClient doesn't have explicit close, but we clear the reference
             self.client = None
 
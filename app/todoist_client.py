@@ -1,8 +1,11 @@
 """Todoist API client for fetching tasks, projects, sections, and comments."""
 
-from typing import Any, Dict, List, Optional, Union
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
+import orjson
+from pydantic import TypeAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.logging_setup import get_logger
@@ -11,6 +14,15 @@ from app.settings import settings
 
 logger = get_logger(__name__)
 
+# Largest page the v1 API returns for paginated endpoints
+_MAX_PAGE_SIZE = 200
+
+# List validators built once at import; each validates a whole page of results in one call
+_TASKS_ADAPTER = TypeAdapter(List[TodoistTask])
+_PROJECTS_ADAPTER = TypeAdapter(List[TodoistProject])
+_SECTIONS_ADAPTER = TypeAdapter(List[TodoistSection])
+_COMMENTS_ADAPTER = TypeAdapter(List[TodoistComment])
+
 
 class TodoistClient:
     """Async HTTP client for Todoist API v1."""
@@ -19,6 +31,7 @@ class TodoistClient:
         self,
         api_token: Optional[str] = None,
         base_url: Optional[str] = None,
+        projects_cache_ttl: Optional[float] = None,
     ) -> None:
         """
         Initialize Todoist client.
@@ -26,6 +39,7 @@ class TodoistClient:
         Args:
             api_token: Todoist OAuth token (defaults to settings)
             base_url: API base URL (defaults to settings)
+            projects_cache_ttl: Seconds to reuse a get_projects() result (defaults to settings)
         """
         self.api_token = api_token or settings.todoist_oauth_token
         self.base_url = base_url or settings.todoist_api_base_url
@@ -34,8 +48,15 @@ class TodoistClient:
             "Content-Type": "application/json",
         }
         # In-memory caches for reducing API calls during reconciliation
-        self._project_cache: Dict[str, "TodoistProject"] = {}
-        self._section_cache: Dict[str, "TodoistSection"] = {}
+        self._project_cache: Dict[str, TodoistProject] = {}
+        self._section_cache: Dict[str, TodoistSection] = {}
+        # Short-lived cache of the full project list: (fetched_at, projects)
+        self._projects_ttl = (
+            projects_cache_ttl
+            if projects_cache_ttl is not None
+            else settings.todoist_projects_cache_ttl
+        )
+        self._projects_list_cache: Optional[Tuple[float, List[TodoistProject]]] = None
 
     @retry(
         stop=stop_after_attempt(settings.max_retries),
@@ -60,7 +81,7 @@ class TodoistClient:
             logger.info("Todoist GET request", extra={"endpoint": endpoint, "params": params})
             response = await client.get(url, headers=self.headers, params=params)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
     @retry(
         stop=stop_after_attempt(settings.max_retries),
@@ -87,7 +108,7 @@ class TodoistClient:
             response.raise_for_status()
             if response.status_code == 204:
                 return None
-            return response.json()
+            return orjson.loads(response.content)
 
     @retry(
         stop=stop_after_attempt(settings.max_retries),
@@ -106,7 +127,12 @@ class TodoistClient:
             response = await client.delete(url, headers=self.headers)
             response.raise_for_status()
 
-    async def _get_paginated(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict]:
+    async def _get_paginated(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
         """
         Fetch all results from a paginated v1 API endpoint.
 
@@ -116,6 +142,7 @@ class TodoistClient:
         Args:
             endpoint: API endpoint
             params: Query parameters
+            limit: Stop after this many results (requests smaller pages to match)
 
         Returns:
             Combined list of all results across pages
@@ -123,6 +150,8 @@ class TodoistClient:
         all_results = []
         cursor = None
         params = dict(params or {})
+        if limit is not None:
+            params["limit"] = min(limit, _MAX_PAGE_SIZE)
 
         while True:
             if cursor:
@@ -134,7 +163,7 @@ class TodoistClient:
             if isinstance(data, dict) and "results" in data:
                 all_results.extend(data["results"])
                 cursor = data.get("next_cursor")
-                if not cursor:
+                if not cursor or (limit is not None and len(all_results) >= limit):
                     break
             elif isinstance(data, list):
                 # Fallback for endpoints that return plain arrays (e.g., projects)
@@ -143,7 +172,7 @@ class TodoistClient:
             else:
                 break
 
-        return all_results
+        return all_results if limit is None else all_results[:limit]
 
     async def get_task(self, task_id: str) -> TodoistTask:
         """
@@ -157,14 +186,17 @@ class TodoistClient:
         """
         logger.info("Fetching Todoist task", extra={"task_id": task_id})
         data = await self._get(f"/tasks/{task_id}")
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
-    async def get_tasks(self, label: Optional[str] = None) -> List[TodoistTask]:
+    async def get_tasks(
+        self, label: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[TodoistTask]:
         """
         Fetch all tasks, optionally filtered by label.
 
         Args:
             label: Filter by label name (e.g., "@capsync")
+            limit: Only fetch this many tasks (all pages when None)
 
         Returns:
             List of TodoistTask objects
@@ -173,9 +205,9 @@ class TodoistClient:
         if label:
             params["label"] = label
 
-        logger.info("Fetching Todoist tasks", extra={"label": label})
-        results = await self._get_paginated("/tasks", params=params)
-        return [TodoistTask(**task) for task in results]
+        logger.info("Fetching Todoist tasks", extra={"label": label, "limit": limit})
+        results = await self._get_paginated("/tasks", params=params, limit=limit)
+        return _TASKS_ADAPTER.validate_python(results)
 
     async def get_project(self, project_id: str) -> TodoistProject:
         """
@@ -192,7 +224,7 @@ class TodoistClient:
 
         logger.info("Fetching Todoist project", extra={"project_id": project_id})
         data = await self._get(f"/projects/{project_id}")
-        project = TodoistProject(**data)
+        project = TodoistProject.model_validate(data)
         self._project_cache[project_id] = project
         return project
 
@@ -200,28 +232,44 @@ class TodoistClient:
         """
         Fetch all projects. Also warms the project cache.
 
+        Results are reused for ``projects_cache_ttl`` seconds so that back-to-back
+        callers (test endpoints, reconcile steps) share one API call.
+
         Returns:
             List of TodoistProject objects
         """
+        if self._projects_list_cache is not None:
+            fetched_at, cached_projects = self._projects_list_cache
+            if time.monotonic() - fetched_at < self._projects_ttl:
+                logger.debug(
+                    "Using cached Todoist project list", extra={"count": len(cached_projects)}
+                )
+                return list(cached_projects)
+
         logger.info("Fetching all Todoist projects")
         # v1 projects endpoint returns a plain array
         data = await self._get("/projects")
         if isinstance(data, dict) and "results" in data:
-            projects = [TodoistProject(**project) for project in data["results"]]
+            projects = _PROJECTS_ADAPTER.validate_python(data["results"])
         else:
-            projects = [TodoistProject(**project) for project in data]
+            projects = _PROJECTS_ADAPTER.validate_python(data)
 
         # Warm the cache so get_project() doesn't need individual API calls
         for p in projects:
             self._project_cache[p.id] = p
         logger.info("Warmed project cache", extra={"count": len(projects)})
 
+        if self._projects_ttl > 0:
+            self._projects_list_cache = (time.monotonic(), projects)
+            return list(projects)
+
         return projects
 
     def clear_caches(self) -> None:
         """Clear in-memory caches. Call between reconciliation runs."""
         self._project_cache.clear()
         self._section_cache.clear()
+        self._projects_list_cache = None
 
     async def get_section(self, section_id: str) -> TodoistSection:
         """
@@ -238,7 +286,7 @@ class TodoistClient:
 
         logger.info("Fetching Todoist section", extra={"section_id": section_id})
         data = await self._get(f"/sections/{section_id}")
-        section = TodoistSection(**data)
+        section = TodoistSection.model_validate(data)
         self._section_cache[section_id] = section
         return section
 
@@ -258,7 +306,7 @@ class TodoistClient:
 
         logger.info("Fetching Todoist sections", extra={"project_id": project_id})
         results = await self._get_paginated("/sections", params=params)
-        return [TodoistSection(**section) for section in results]
+        return _SECTIONS_ADAPTER.validate_python(results)
 
     async def get_comments(self, task_id: str) -> List[TodoistComment]:
         """
@@ -272,7 +320,7 @@ class TodoistClient:
         """
         logger.info("Fetching Todoist comments", extra={"task_id": task_id})
         results = await self._get_paginated("/comments", params={"task_id": task_id})
-        return [TodoistComment(**comment) for comment in results]
+        return _COMMENTS_ADAPTER.validate_python(results)
 
     async def get_active_tasks_with_label(self, label: str = "capsync") -> List[TodoistTask]:
         """
@@ -298,7 +346,7 @@ class TodoistClient:
 
         try:
             results = await self._get_paginated("/tasks", params=params)
-            tasks = [TodoistTask(**task) for task in results]
+            tasks = _TASKS_ADAPTER.validate_python(results)
             logger.info(
                 "Fetched tasks with label",
                 extra={"label": label_filter, "count": len(tasks)},
@@ -337,7 +385,7 @@ class TodoistClient:
             extra={"task_id": task_id, "description_length": len(new_description)},
         )
         data = await self._post(f"/tasks/{task_id}", {"description": new_description})
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def add_label_to_task(self, task_id: str, label: str, current_labels: List[str]) -> TodoistTask:
         """
@@ -368,7 +416,7 @@ class TodoistClient:
             extra={"task_id": task_id, "label": label},
         )
         data = await self._post(f"/tasks/{task_id}", {"labels": updated_labels})
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def remove_label_from_task(self, task_id: str, label: str, current_labels: List[str]) -> TodoistTask:
         """
@@ -405,7 +453,7 @@ class TodoistClient:
             extra={"task_id": task_id, "label": label},
         )
         data = await self._post(f"/tasks/{task_id}", {"labels": updated_labels})
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def update_task_title(self, task_id: str, new_title: str) -> TodoistTask:
         """
@@ -420,7 +468,7 @@ class TodoistClient:
         """
         logger.info("Updating Todoist task title", extra={"task_id": task_id})
         data = await self._post(f"/tasks/{task_id}", {"content": new_title})
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def update_task_priority(self, task_id: str, priority: int) -> TodoistTask:
         """
@@ -435,7 +483,7 @@ class TodoistClient:
         """
         logger.info("Updating Todoist task priority", extra={"task_id": task_id, "priority": priority})
         data = await self._post(f"/tasks/{task_id}", {"priority": priority})
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def update_project_name(self, project_id: str, new_name: str) -> TodoistProject:
         """
@@ -450,7 +498,11 @@ class TodoistClient:
         """
         logger.info("Updating Todoist project name", extra={"project_id": project_id})
         data = await self._post(f"/projects/{project_id}", {"name": new_name})
-        return TodoistProject(**data)
+        project = TodoistProject.model_validate(data)
+        # Project list is now stale
+        self._projects_list_cache = None
+        self._project_cache[project_id] = project
+        return project
 
     async def get_parent_project(self, project_id: str) -> Optional[TodoistProject]:
         """
@@ -504,7 +556,7 @@ class TodoistClient:
             payload["labels"] = labels
 
         data = await self._post("/tasks", payload)
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def update_task(
         self,
@@ -540,7 +592,7 @@ class TodoistClient:
             return await self.get_task(task_id)
 
         data = await self._post(f"/tasks/{task_id}", payload)
-        return TodoistTask(**data)
+        return TodoistTask.model_validate(data)
 
     async def complete_task(self, task_id: str) -> None:
         """
@@ -8,6 +8,15 @@ import orjson
 
 from app.settings import settings
 
+# Label names that mark a task for syncing (Todoist returns names without "@", but
+# older payloads and callers use the prefixed form)
+_CAPSYNC_LABELS = frozenset({"capsync", "@capsync"})
+
+
+# Prefix on stored payload hashes. Bump it whenever the hash input or algorithm
+# changes so stale hashes are recognizable; untagged hashes are legacy SHA-256.
+PAYLOAD_HASH_VERSION = "v2"
+
 
 def compute_payload_hash(data: Dict[str, Any]) -> str:
     """
@@ -17,14 +26,31 @@ def compute_payload_hash(data: Dict[str, Any]) -> str:
         data: Dictionary to hash
 
     Returns:
-        SHA-256 hash as hex string
+        Version-tagged 128-bit BLAKE2b hash, e.g. "v2:<32 hex chars>"
+    """
+    # Use orjson for deterministic JSON serialization; BLAKE2b is cheaper than
+    # SHA-256 on short inputs and this hash is only compared, never trusted
+    json_bytes = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    digest = hashlib.blake2b(json_bytes, digest_size=16).hexdigest()
+    return f"{PAYLOAD_HASH_VERSION}:{digest}"
+
+
+def error_text(e: BaseException) -> str:
     """
-    # Use orjson for deterministic JSON serialization
-    json_bytes = orjson.dumps(
-        data,
-        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY,
-    )
-    return hashlib.sha256(json_bytes).hexdigest()
+    Describe an exception for an API response or stored run summary.
+
+    Returns the exception message when ``expose_error_details`` is enabled,
+    otherwise only the exception class name so internals aren't leaked.
+
+    Args:
+        e: Exception being reported
+
+    Returns:
+        Text to include in the response body
+    """
+    if settings.expose_error_details:
+        return str(e)
+    return e.__class__.__name__
 
 
 def get_current_timestamp() -> str:
@@ -47,7 +73,8 @@ def has_capsync_label(labels: list[str]) -> bool:
     Returns:
         True if @capsync label is present
     """
-    return "@capsync" in labels or "capsync" in labels
+    # One C-level pass over labels that stops at the first hit
+    return not _CAPSYNC_LABELS.isdisjoint(labels)
 
 
 def format_markdown_comments(comments: List[Dict[str, Any]]) -> str:
@@ -127,8 +154,6 @@ def extract_para_areas(labels: List[str]) -> List[str]:
     Returns:
         List of area names (empty list if none found)
     """
-    from app.settings import settings
-    
     if not settings.enable_para_areas or not labels:
         return []
     
@@ -166,8 +191,6 @@ def extract_person_labels(labels: List[str]) -> List[str]:
     Returns:
         List of person names (without emoji)
     """
-    from app.settings import settings
-    
     if not settings.enable_people_matching or not labels:
         return []
     
@@ -191,8 +214,6 @@ def get_area_label_from_parent_project(project_name: str) -> Optional[str]:
     Returns:
         Matching area label name if found, None otherwise
     """
-    from app.settings import settings
-
     if not settings.enable_para_areas or not project_name:
         return None
 
@@ -66,6 +66,18 @@ resource "google_cloud_run_service" "sync_service" {
           value = var.capacities_space_id
         }
 
+        # Only the scheduler's service account may call /reconcile with an OIDC token
+        env {
+          name  = "OIDC_SERVICE_ACCOUNT_EMAIL"
+          value = google_service_account.scheduler.email
+        }
+
+        # Must match the audience in the scheduler job's oidc_token
+        env {
+          name  = "OIDC_AUDIENCE"
+          value = var.reconcile_oidc_audience
+        }
+
         # Secrets from Secret Manager
         env {
           name = "TODOIST_OAUTH_TOKEN"
@@ -110,6 +122,8 @@ resource "google_cloud_run_service" "sync_service" {
       annotations = {
         "autoscaling.knative.dev/maxScale" = "10"
         "autoscaling.knative.dev/minScale" = "0"
+        # Keep CPU allocated after the response so background reconciles finish
+        "run.googleapis.com/cpu-throttling" = "false"
       }
     }
   }
@@ -31,6 +31,8 @@ resource "google_cloud_scheduler_job" "reconcile" {
     # Authorization header with internal token
     oidc_token {
       service_account_email = google_service_account.scheduler.email
+      # Must match OIDC_AUDIENCE on the Cloud Run service
+      audience = var.reconcile_oidc_audience
     }
 
     # Note: The INTERNAL_CRON_TOKEN will need to be passed in the Authorization header
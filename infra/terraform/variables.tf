@@ -55,3 +55,9 @@ variable "reconcile_schedule" {
   default     = "0 5-22/2 * * *"
 }
 
+
+variable "reconcile_oidc_audience" {
+  description = "Audience of the OIDC tokens Cloud Scheduler sends to /reconcile (passed to the service as OIDC_AUDIENCE)"
+  type        = string
+  default     = "todoist-capacities-sync-reconcile"
+}
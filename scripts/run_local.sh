@@ -16,6 +16,6 @@ fi
 # Load environment variables
 export $(cat .env | grep -v '^#' | xargs)
 
-# Run with Poetry
-poetry run python -m app.main
+# Run with Poetry (ENVIRONMENT=local enables auto-reload)
+ENVIRONMENT=local poetry run python -m app.main
 
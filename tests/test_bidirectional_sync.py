@@ -1,5 +1,6 @@
 """Tests for bidirectional Notion→Todoist sync."""
 
+import asyncio
 import hashlib
 import json
 from datetime import datetime, timezone
@@ -18,7 +19,6 @@ from app.reverse_mapper import (
     notion_props_differ,
 )
 
-
 # ============================================================================
 # reverse_mapper tests
 # ============================================================================
@@ -377,7 +377,7 @@ class TestSyncNotionToTodoist:
         )
 
         # Mock Todoist task
-        from app.models import TodoistTask, TodoistProject
+        from app.models import TodoistProject, TodoistTask
 
         mock_todoist_client.get_task.return_value = TodoistTask(
             id="task-abc",
@@ -444,7 +444,7 @@ class TestSyncNotionToTodoist:
             sync_status=SyncStatus.OK,
         )
 
-        from app.models import TodoistTask, TodoistProject
+        from app.models import TodoistProject, TodoistTask
 
         mock_todoist_client.get_task.return_value = TodoistTask(
             id="task-abc",
@@ -535,7 +535,7 @@ class TestCreateTodoistTasksFromNotion:
             )
         ]
 
-        from app.models import TodoistTask, TodoistProject
+        from app.models import TodoistProject, TodoistTask
 
         mock_todoist_client.create_task.return_value = TodoistTask(
             id="new-task-xyz",
@@ -630,3 +630,138 @@ class TestCreateTodoistTasksFromNotion:
 
         assert result == 0
         reconcile_handler.todoist.create_task.assert_not_called()
+
+
+class TestRunInBackground:
+    """Tests for background reconciliation runs."""
+
+    @pytest.mark.asyncio
+    async def test_records_summary(self, reconcile_handler, mock_store):
+        """A background run stores the reconcile summary with timing info."""
+        reconcile_handler.reconcile = AsyncMock(return_value={"status": "completed", "upserted": 3})
+
+        await reconcile_handler.run_in_background()
+
+        mock_store.set_last_reconcile_summary.assert_called_once()
+        summary = mock_store.set_last_reconcile_summary.call_args[0][0]
+        assert summary["status"] == "completed"
+        assert summary["upserted"] == 3
+        assert "finished_at" in summary
+        assert not reconcile_handler.is_running
+
+    @pytest.mark.asyncio
+    async def test_records_error(self, reconcile_handler, mock_store):
+        """A failed run is recorded as an error instead of raising."""
+        reconcile_handler.reconcile = AsyncMock(side_effect=RuntimeError("boom"))
+
+        await reconcile_handler.run_in_background()
+
+        summary = mock_store.set_last_reconcile_summary.call_args[0][0]
+        assert summary["status"] == "error"
+        # The message stays out of the stored summary unless details are exposed
+        assert summary["error"] == "RuntimeError"
+
+        with patch("app.utils.settings.expose_error_details", True):
+            await reconcile_handler.run_in_background()
+
+        summary = mock_store.set_last_reconcile_summary.call_args[0][0]
+        assert summary["error"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_skips_when_already_running(self, reconcile_handler, mock_store):
+        """Overlapping runs are skipped while one is in progress."""
+        reconcile_handler.reconcile = AsyncMock(return_value={"status": "completed"})
+
+        async with reconcile_handler._run_lock:
+            assert reconcile_handler.is_running
+            await reconcile_handler.run_in_background()
+
+        reconcile_handler.reconcile.assert_not_called()
+        mock_store.set_last_reconcile_summary.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_start_run_claims_run_id(self, reconcile_handler, mock_store):
+        """Starting a run claims a fresh run ID in the store."""
+        mock_store.claim_reconcile_run.return_value = True
+
+        run_id = await reconcile_handler.start_run()
+
+        assert run_id
+        assert mock_store.claim_reconcile_run.call_args[0][0] == run_id
+
+    @pytest.mark.asyncio
+    async def test_start_run_refused_while_claimed(self, reconcile_handler, mock_store):
+        """No run is started while another holds the claim."""
+        mock_store.claim_reconcile_run.return_value = False
+
+        assert await reconcile_handler.start_run() is None
+
+    @pytest.mark.asyncio
+    async def test_run_record_saved_and_claim_released(self, reconcile_handler, mock_store):
+        """A claimed run records its summary under its ID and releases the claim."""
+        reconcile_handler.reconcile = AsyncMock(return_value={"status": "completed"})
+
+        await reconcile_handler.run_in_background("abc123")
+
+        mock_store.save_reconcile_run.assert_called_once()
+        run_id, record = mock_store.save_reconcile_run.call_args[0]
+        assert run_id == "abc123"
+        assert record["status"] == "completed"
+        assert record["run_id"] == "abc123"
+        mock_store.release_reconcile_run.assert_called_once_with("abc123")
+
+
+class TestConcurrentReconcileSync:
+    """Tests for concurrent task upserts and archives during reconciliation."""
+
+    @pytest.mark.asyncio
+    async def test_upserts_projects_in_parallel_and_tasks_in_order(self, reconcile_handler):
+        """Different projects overlap up to the limit; a project's tasks stay in order."""
+        from app.models import TodoistTask
+
+        tasks = [
+            TodoistTask(
+                id=f"{project}-{n}",
+                content="t",
+                project_id=project,
+                added_at="2025-01-01T00:00:00Z",
+            )
+            for project in ("a", "b", "c")
+            for n in range(3)
+        ]
+        order = []
+        in_flight = 0
+        peak = 0
+
+        async def process(message, sync_source="webhook"):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            order.append(message.todoist_task_id)
+            if message.todoist_task_id == "b-1":
+                raise RuntimeError("Notion unavailable")
+
+        reconcile_handler.worker = MagicMock()
+        reconcile_handler.worker.process_message = AsyncMock(side_effect=process)
+
+        upserted = await reconcile_handler._upsert_tasks(tasks, asyncio.Semaphore(2))
+
+        assert upserted == 8
+        assert peak == 2
+        for project in ("a", "b", "c"):
+            assert [t for t in order if t[0] == project] == [f"{project}-{n}" for n in range(3)]
+
+    @pytest.mark.asyncio
+    async def test_archives_count_successes(self, reconcile_handler):
+        """Archive failures are logged and left out of the count."""
+        reconcile_handler.worker = MagicMock()
+        reconcile_handler.worker.process_message = AsyncMock(
+            side_effect=[None, RuntimeError("gone"), None]
+        )
+
+        archived = await reconcile_handler._archive_tasks(["1", "2", "3"], asyncio.Semaphore(2))
+
+        assert archived == 2
+        assert reconcile_handler.worker.process_message.await_count == 3
@@ -174,7 +174,6 @@ class TestEndToEndSyncWorkflow:
     ):
         """Test that unchanged tasks are not re-synced (idempotency)."""
         from app.models import TaskSyncState, SyncStatus
-        from app.utils import compute_payload_hash
         from app.mapper import map_task_to_todo
 
         # Create the task data
@@ -186,7 +185,7 @@ class TestEndToEndSyncWorkflow:
         existing_state = TaskSyncState(
             todoist_task_id="12345678",
             capacities_object_id="notion_page_id",
-            payload_hash=compute_payload_hash(todo.model_dump()),
+            payload_hash=todo.payload_hash(),
             last_synced_at=datetime.now(),
             sync_status=SyncStatus.OK,
         )
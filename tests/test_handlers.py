@@ -0,0 +1,102 @@
+"""Tests for the webhook handler's Pub/Sub publishing."""
+
+import asyncio
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from app.handlers import WebhookHandler
+from app.models import TodoistWebhookEvent
+
+
+@pytest.fixture
+def mock_publisher():
+    """Mock Pub/Sub publisher client."""
+    publisher = MagicMock()
+    publisher.topic_path.return_value = "projects/test/topics/sync"
+    return publisher
+
+
+@pytest.fixture
+def webhook_event():
+    """Sample item:updated webhook event."""
+    return TodoistWebhookEvent(
+        event_name="item:updated",
+        event_data={"id": "12345678", "content": "Test task"},
+        user_id="1",
+    )
+
+
+@pytest.mark.asyncio
+class TestWebhookHandlerPublishing:
+    """Test how webhook events reach Pub/Sub."""
+
+    async def test_publishes_directly_when_not_started(self, mock_publisher, webhook_event):
+        """Without the background publisher, messages are published inline."""
+        future = Future()
+        future.set_result("message-id")
+        mock_publisher.publish.return_value = future
+        handler = WebhookHandler(mock_publisher)
+
+        result = await handler.handle_event(webhook_event)
+
+        assert result["status"] == "queued"
+        mock_publisher.publish.assert_called_once()
+        topic, data = mock_publisher.publish.call_args[0]
+        assert topic == "projects/test/topics/sync"
+        assert orjson.loads(data)["todoist_task_id"] == "12345678"
+        assert mock_publisher.publish.call_args[1] == {}
+
+    async def test_queued_messages_published_on_close(self, mock_publisher, webhook_event):
+        """Queued messages are drained and acknowledged before close returns."""
+        futures = []
+
+        def publish(*args, **kwargs):
+            future = Future()
+            futures.append(future)
+            # Acknowledge shortly after publish returns, like the real publisher
+            asyncio.get_running_loop().call_later(0.01, future.set_result, "message-id")
+            return future
+
+        mock_publisher.publish.side_effect = publish
+        handler = WebhookHandler(mock_publisher)
+        await handler.start()
+
+        for _ in range(3):
+            await handler.handle_event(webhook_event)
+        await handler.close()
+
+        assert mock_publisher.publish.call_count == 3
+        assert all(f.done() for f in futures)
+
+    async def test_event_acknowledged_only_after_publish(self, mock_publisher, webhook_event):
+        """handle_event waits for the Pub/Sub ack and raises if the publish fails."""
+        future = Future()
+        mock_publisher.publish.return_value = future
+        handler = WebhookHandler(mock_publisher)
+        await handler.start()
+
+        pending = asyncio.ensure_future(handler.handle_event(webhook_event))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        future.set_exception(RuntimeError("Pub/Sub unavailable"))
+        with pytest.raises(RuntimeError):
+            await pending
+        await handler.close()
+
+    async def test_ignored_event_not_published(self, mock_publisher):
+        """Irrelevant events are not published."""
+        handler = WebhookHandler(mock_publisher)
+        event = TodoistWebhookEvent(
+            event_name="project:added",
+            event_data={"id": "1"},
+            user_id="1",
+        )
+
+        result = await handler.handle_event(event)
+
+        assert result == {"status": "ignored", "reason": "irrelevant_event"}
+        mock_publisher.publish.assert_not_called()
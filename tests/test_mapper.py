@@ -39,6 +39,19 @@ def test_map_task_to_todo_basic() -> None:
     assert todo.sync_status == "ok"
 
 
+def test_map_task_to_todo_uses_given_timestamp() -> None:
+    """Test that a caller-supplied timestamp is used instead of reading the clock."""
+    task = TodoistTask(
+        id="123", content="Test task", project_id="proj-1", added_at="2025-01-01T00:00:00Z"
+    )
+    project = TodoistProject(id="proj-1", name="Work Project", color="blue")
+
+    todo = map_task_to_todo(task, project, [], now="2025-06-01T12:00:00+00:00")
+
+    assert todo.updated_at == "2025-06-01T12:00:00+00:00"
+    assert todo.last_synced_at == "2025-06-01T12:00:00+00:00"
+
+
 def test_map_task_with_due_date() -> None:
     """Test task mapping with due date."""
     task = TodoistTask(
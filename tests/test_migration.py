@@ -0,0 +1,179 @@
+"""Tests for the one-time Todoist v1 ID migration."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+
+from app.migration import _is_v1_id, _notion_text, run_v1_id_migration
+from app.models import TodoistProject, TodoistTask
+
+
+def _task(task_id: str, content: str, project_id: str = "proj1") -> TodoistTask:
+    """Build a minimal v1 Todoist task."""
+    return TodoistTask(
+        id=task_id,
+        content=content,
+        project_id=project_id,
+        added_at="2025-10-01T10:00:00Z",
+    )
+
+
+def _page(page_id: str, todoist_id: str, name: str, id_prop: str = "Todoist Task ID") -> dict:
+    """Build a Notion page with a Todoist ID and a title."""
+    return {
+        "id": page_id,
+        "properties": {
+            id_prop: {"rich_text": [{"text": {"content": todoist_id}}] if todoist_id else []},
+            "Name": {"title": [{"text": {"content": name}}]},
+        },
+    }
+
+
+@pytest.fixture
+def clients():
+    """Mock Todoist/Notion clients and store holding one of each kind of page."""
+    todoist = MagicMock()
+    todoist.get_active_tasks_with_label = AsyncMock(return_value=[
+        _task("abc1", "Buy milk"),
+        _task("dup1", "Dup"),
+        _task("dup2", "Dup"),
+    ])
+    todoist.get_projects = AsyncMock(return_value=[
+        TodoistProject(id="proj1", name="Home", color="red"),
+    ])
+
+    notion = MagicMock()
+    task_pages = [
+        _page("old-milk", "123", "Buy milk "),
+        _page("new-milk", "abc1", "Buy milk"),
+        _page("old-dup", "456", "Dup"),
+        _page("no-id", "", "Untracked"),
+        _page("new-only", "zz9", "New one"),
+        _page("old-gone", "789", "Gone"),
+    ]
+
+    async def iter_task_pages():
+        for page in task_pages:
+            yield page
+
+    notion.iter_task_pages = iter_task_pages
+    notion.get_all_project_pages = AsyncMock(return_value=[
+        _page("old-home", "111", "Home", id_prop="Todoist Project ID"),
+    ])
+    notion.update_todoist_task_id = AsyncMock()
+    notion.update_todoist_project_id = AsyncMock()
+    notion.archive_page = AsyncMock()
+    notion.client.pages.update = AsyncMock()
+
+    store = MagicMock()
+    store.clear_all_task_states = AsyncMock(return_value=0)
+    store.save_task_states = AsyncMock(side_effect=lambda states: len(states))
+    store.save_project_states = AsyncMock(side_effect=lambda states: len(states))
+    return todoist, notion, store
+
+
+class TestMigrationHelpers:
+    """Test page parsing helpers."""
+
+    def test_notion_text_prefers_rich_text(self):
+        """Rich text wins over title, and missing properties give an empty string."""
+        props = {"A": {"rich_text": [{"text": {"content": "r"}}], "title": []}}
+        assert _notion_text(props, "A") == "r"
+        assert _notion_text(props, "B") == ""
+        assert _notion_text({}, "A") == ""
+        # An empty rich_text list falls back to the title
+        title_props = {"Name": {"rich_text": [], "title": [{"text": {"content": "t"}}]}}
+        assert _notion_text(title_props, "Name") == "t"
+
+    def test_is_v1_id(self):
+        """Only non-empty, non-numeric IDs are v1 IDs."""
+        assert _is_v1_id("6X7rM8997g3RQmvh")
+        assert _is_v1_id("123abc")
+        assert not _is_v1_id("123456")
+        assert not _is_v1_id("")
+
+
+@pytest.mark.asyncio
+class TestRunV1IdMigration:
+    """Test migration planning and execution."""
+
+    async def test_dry_run_plans_without_writing(self, clients):
+        """A dry run matches pages by title and reports the plan only."""
+        todoist, notion, store = clients
+
+        summary = await run_v1_id_migration(todoist, notion, store, dry_run=True)
+
+        assert summary["status"] == "dry_run"
+        assert summary["notion_task_pages"] == 6
+        assert summary["categorization"] == {"old_id_pages": 3, "new_id_pages": 2, "no_id_pages": 1}
+        assert summary["tasks"] == {
+            "matched": 2,
+            "ambiguous": 1,
+            "unmatched_old": 1,
+            "duplicates_to_archive": 1,
+            "genuinely_new": 1,
+        }
+        assert summary["duplicates_sample"][0]["page_id"] == "new-milk"
+        # Samples carry no Todoist models, so the summary stays JSON-serializable
+        assert "v1_task" not in summary["matched_tasks_sample"][0]
+        assert "v1_project" not in summary["matched_projects_sample"][0]
+        orjson.dumps(summary)
+        assert summary["projects"] == {"matched": 1}
+        notion.update_todoist_task_id.assert_not_called()
+        store.clear_all_task_states.assert_not_called()
+
+    async def test_execute_bounds_concurrent_notion_writes(self, clients):
+        """Notion updates overlap up to the configured limit and failures are counted."""
+        todoist, notion, store = clients
+        in_flight = 0
+        peak = 0
+
+        async def update(page_id, new_id, todoist_url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if page_id == "old-dup":
+                raise RuntimeError("Notion unavailable")
+
+        notion.update_todoist_task_id = AsyncMock(side_effect=update)
+
+        with patch("app.migration.settings.migration_concurrency", 2):
+            summary = await run_v1_id_migration(todoist, notion, store, dry_run=False)
+
+        assert peak == 2
+        execution = summary["execution"]
+        assert execution["tasks_updated"] == 1
+        assert execution["tasks_failed"] == 1
+        assert execution["duplicates_archived"] == 1
+        assert execution["projects_updated"] == 1
+        notion.archive_page.assert_awaited_once_with("new-milk")
+        # ID and URL go out in the same request
+        notion.client.pages.update.assert_not_called()
+        notion.update_todoist_project_id.assert_awaited_once_with(
+            "old-home", "proj1", "https://app.todoist.com/app/project/proj1"
+        )
+        # Firestore task state is written in one batched call each for matched and new tasks
+        saved_groups = [
+            [s.todoist_task_id for s in call.args[0]]
+            for call in store.save_task_states.await_args_list
+        ]
+        assert saved_groups == [["abc1", "dup1"], []]
+        assert execution["task_states_saved"] == 2
+        assert execution["new_task_states_saved"] == 0
+        assert execution["project_states_saved"] == 1
+
+    async def test_execute_reports_partially_saved_states(self, clients):
+        """Counts reflect only the states whose batches were committed."""
+        todoist, notion, store = clients
+        # The matched group loses one state to a failed batch
+        store.save_task_states = AsyncMock(side_effect=lambda states: max(len(states) - 1, 0))
+
+        summary = await run_v1_id_migration(todoist, notion, store, dry_run=False)
+
+        execution = summary["execution"]
+        assert execution["task_states_saved"] == 1
+        assert execution["new_task_states_saved"] == 0
@@ -93,6 +93,25 @@ class TestNotionModels:
         assert project.name == "Test Project"
         assert project.is_shared is False  # Default value
 
+    def test_notion_todo_payload_hash_ignores_sync_timestamps(self):
+        """Test that the payload hash tracks content but not sync timestamps."""
+        todo = NotionToDo(
+            title="Test",
+            todoist_task_id="123",
+            todoist_url="https://app.todoist.com/app/task/123",
+            todoist_project_id="456",
+            todoist_project_name="Project",
+            created_at="2025-10-09T12:00:00Z",
+            updated_at="2025-10-09T12:00:00Z",
+        )
+        resynced = todo.model_copy(
+            update={"updated_at": "2025-10-10T08:00:00Z", "last_synced_at": "2025-10-10T08:00:00Z"}
+        )
+        edited = todo.model_copy(update={"title": "Edited"})
+
+        assert todo.payload_hash() == resynced.payload_hash()
+        assert todo.payload_hash() != edited.payload_hash()
+
 
 class TestSyncModels:
     """Test sync-related models."""
@@ -128,6 +147,12 @@ class TestSyncModels:
         assert message.snapshot is not None
         assert message.snapshot["content"] == "Test"
 
+    def test_pubsub_message_is_frozen(self):
+        """Test PubSub messages cannot be mutated after construction."""
+        message = PubSubMessage(action=SyncAction.UPSERT, todoist_task_id="12345")
+        with pytest.raises(ValidationError):
+            message.todoist_task_id = "other"
+
 
 class TestModelValidation:
     """Test model validation rules."""
@@ -1,10 +1,13 @@
 """Integration tests for Notion API client (with mocking)."""
 
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from notion_client import APIResponseError
 
+from app.models import NotionProject, NotionToDo
 from app.notion_client import NotionClient
-from app.models import NotionToDo, NotionProject
 
 
 @pytest.fixture
@@ -16,6 +19,7 @@ def notion_client():
         mock_settings.notion_projects_database_id = "test_projects_db"
         mock_settings.max_retries = 3
         mock_settings.retry_delay = 0.1  # Faster for tests
+        mock_settings.notion_people_cache_ttl = 300
         
         client = NotionClient(
             api_key="test_key",
@@ -71,9 +75,25 @@ class TestNotionClientProjectOperations:
             mock_query.return_value = mock_response
             
             result = await notion_client.find_project_by_todoist_id("nonexistent")
-            
+
             assert result is None
 
+    async def test_update_todoist_project_id_with_url(self, notion_client):
+        """Test that the new ID and URL are written in a single page update."""
+        with patch.object(
+            notion_client.client.pages, "update", new_callable=AsyncMock
+        ) as mock_update:
+            mock_update.return_value = {"id": "page123"}
+
+            await notion_client.update_todoist_project_id(
+                "page123", "abc", "https://app.todoist.com/app/project/abc"
+            )
+
+            mock_update.assert_awaited_once()
+            properties = mock_update.call_args.kwargs["properties"]
+            assert properties["Todoist Project ID"]["rich_text"][0]["text"]["content"] == "abc"
+            assert properties["Todoist URL"] == {"url": "https://app.todoist.com/app/project/abc"}
+
 
 @pytest.mark.asyncio
 class TestNotionClientTodoOperations:
@@ -126,11 +146,11 @@ class TestNotionClientTodoOperations:
             
             await notion_client.create_todo_page(sample_notion_todo)
             
-            # Verify content was added
-            mock_append.assert_awaited_once()
-            call_args = mock_append.call_args
-            blocks = call_args.kwargs["children"]
+            # Verify content was sent inline with the page creation
+            mock_create.assert_awaited_once()
+            blocks = mock_create.call_args.kwargs["children"]
             assert len(blocks) > 0
+            mock_append.assert_not_awaited()
 
     async def test_update_todo_page(self, notion_client, sample_notion_todo):
         """Test updating an existing todo page."""
@@ -162,6 +182,24 @@ class TestNotionClientTodoOperations:
             assert result is not None
             assert result["id"] == "page456"
 
+    async def test_iter_task_pages_streams_every_batch(self, notion_client):
+        """Test that task pages are yielded across paginated query batches."""
+        responses = [
+            {"results": [{"id": "p1"}, {"id": "p2"}], "has_more": True, "next_cursor": "c1"},
+            {"results": [{"id": "p3"}], "has_more": False, "next_cursor": None},
+        ]
+
+        with patch.object(
+            notion_client, "_query_database_direct", new_callable=AsyncMock
+        ) as mock_query:
+            mock_query.side_effect = responses
+
+            pages = [page["id"] async for page in notion_client.iter_task_pages()]
+
+            assert pages == ["p1", "p2", "p3"]
+            assert mock_query.await_count == 2
+            assert mock_query.call_args.kwargs["start_cursor"] == "c1"
+
     async def test_archive_page(self, notion_client):
         """Test archiving a page."""
         mock_response = {"id": "page456", "archived": True}
@@ -205,6 +243,30 @@ class TestNotionClientErrorHandling:
             
             assert mock_create.await_count == 3  # max_retries from fixture
 
+    async def test_migration_write_retries_rate_limit(self, notion_client):
+        """Test that bulk migration writes retry 429 responses and nothing else."""
+        rate_limited = APIResponseError(
+            "rate_limited", 429, "Rate limited", httpx.Headers(), ""
+        )
+
+        pages = notion_client.client.pages
+        with patch.object(pages, "update", new_callable=AsyncMock) as mock_update, \
+             patch("asyncio.sleep", new_callable=AsyncMock):
+            mock_update.side_effect = [rate_limited, {"id": "page123"}]
+
+            result = await notion_client.update_todoist_task_id("page123", "abc")
+
+            assert result["id"] == "page123"
+            assert mock_update.await_count == 2
+
+            mock_update.reset_mock()
+            mock_update.side_effect = Exception("Validation failed")
+
+            with pytest.raises(Exception, match="Validation failed"):
+                await notion_client.archive_page("page123")
+
+            assert mock_update.await_count == 1
+
     async def test_comment_truncation(self, notion_client, sample_notion_todo):
         """Test that long comments are truncated."""
         # Create a comment longer than 2000 chars
@@ -219,13 +281,16 @@ class TestNotionClientErrorHandling:
             
             await notion_client.create_todo_page(sample_notion_todo)
             
+            # Body blocks go out with the page, so no follow-up append is needed
+            mock_append.assert_not_awaited()
+
             # Verify content was truncated
-            call_args = mock_append.call_args
+            call_args = mock_create.call_args
             blocks = call_args.kwargs["children"]
             comment_block = next((b for b in blocks if b["type"] == "paragraph"), None)
-            if comment_block:
-                content = comment_block["paragraph"]["rich_text"][0]["text"]["content"]
-                assert len(content) <= 2000
+            assert comment_block is not None
+            content = comment_block["paragraph"]["rich_text"][0]["text"]["content"]
+            assert len(content) <= 2000
 
 
 @pytest.mark.asyncio
@@ -299,3 +364,28 @@ class TestNotionClientAreasOperations:
             assert relations[1]["id"] == "area2"
             assert relations[2]["id"] == "area3"
 
+    async def test_match_people_fetches_people_once(self, notion_client):
+        """Test that all labels resolve against one People fetch, reused across calls."""
+        notion_client.people_db_id = "test_people_db"
+        mock_response = {
+            "results": [
+                {
+                    "id": "p1",
+                    "properties": {"Name": {"title": [{"text": {"content": "Doug Diego"}}]}},
+                },
+                {"id": "p2", "properties": {"Name": {"title": [{"text": {"content": "Varsha"}}]}}},
+                {"id": "p3", "properties": {"Name": {"title": []}}},
+            ]
+        }
+
+        with patch.object(
+            notion_client, "_query_database_direct", new_callable=AsyncMock
+        ) as mock_query:
+            mock_query.return_value = mock_response
+
+            matched = await notion_client.match_people(["DougD", "varsha", "Nobody"])
+            again = await notion_client.match_people(["VarshaA"])
+
+            assert matched == ["p1", "p2"]
+            assert again == ["p2"]
+            mock_query.assert_awaited_once()
@@ -0,0 +1,203 @@
+"""Tests for Cloud Scheduler OIDC token verification."""
+
+import datetime
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from app.oidc import GoogleCertCache, verify_oidc_token
+
+AUDIENCE = "https://sync.example.com/reconcile"
+SERVICE_ACCOUNT = "scheduler@example.iam.gserviceaccount.com"
+
+
+def _make_key_pair():
+    """Create an RSA signing key and a matching self-signed PEM certificate."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return key_pem, cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    """Signing key and certificate shared by the tests in this module."""
+    return _make_key_pair()
+
+
+def _make_token(key_pem: bytes, kid: str = "kid-1", **overrides) -> str:
+    """Sign an ID token shaped like the ones Cloud Scheduler sends."""
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": AUDIENCE,
+        "iat": now,
+        "exp": now + 300,
+        "email": SERVICE_ACCOUNT,
+        "email_verified": True,
+    }
+    payload.update(overrides)
+    signer = crypt.RSASigner.from_string(key_pem, key_id=kid)
+    return jwt.encode(signer, payload).decode("utf-8")
+
+
+@pytest.mark.asyncio
+class TestGoogleCertCache:
+    """Test certificate caching and rotation."""
+
+    async def test_certificates_fetched_once_while_fresh(self):
+        """Cached certificates are reused until the TTL expires."""
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"a": "cert-a"})) as fetch:
+            assert await cache.get_certs("a") == {"a": "cert-a"}
+            assert await cache.get_certs("a") == {"a": "cert-a"}
+
+        fetch.assert_awaited_once()
+
+    async def test_previous_certificates_kept_after_rotation(self):
+        """Keys from the previous fetch still resolve after Google rotates."""
+        cache = GoogleCertCache(ttl=0)
+        fetch = AsyncMock(side_effect=[{"a": "cert-a"}, {"b": "cert-b"}])
+        with patch.object(cache, "_fetch", new=fetch):
+            await cache.get_certs("a")
+            assert await cache.get_certs("b") == {"b": "cert-b"}
+            cache.ttl = 60
+            cache._expires_at = time.monotonic() + 60
+            assert await cache.get_certs("a") == {"a": "cert-a"}
+
+    async def test_http_client_reused_across_refreshes(self):
+        """Refreshes share one pooled HTTP client, which close() shuts down."""
+        cache = GoogleCertCache(ttl=0)
+        request = httpx.Request("GET", "https://www.googleapis.com/oauth2/v1/certs")
+        response = httpx.Response(200, json={"a": "cert-a"}, request=request)
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = response
+            await cache.get_certs("a")
+            client = cache._http_client
+            await cache.get_certs("a")
+
+        assert mock_get.await_count == 2
+        assert cache._http_client is client
+        await cache.close()
+        assert client.is_closed
+
+    async def test_unknown_kid_does_not_refetch_fresh_certificates(self):
+        """An unknown kid right after a refresh doesn't trigger another fetch."""
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"a": "cert-a"})) as fetch:
+            await cache.get_certs("a")
+            assert await cache.get_certs("unknown") == {}
+
+        fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestVerifyOidcToken:
+    """Test OIDC token verification."""
+
+    @pytest.fixture(autouse=True)
+    def service_account(self):
+        """Configure the expected service account for every test."""
+        with patch("app.oidc.settings.oidc_service_account_email", SERVICE_ACCOUNT):
+            yield
+
+    async def test_valid_token(self, key_pair):
+        """A correctly signed token for the expected audience is accepted."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            claims = await verify_oidc_token(_make_token(key_pem), AUDIENCE, cache)
+
+        assert claims is not None
+        assert claims["email"] == SERVICE_ACCOUNT
+
+    async def test_verified_token_cached_until_expiry(self, key_pair):
+        """Replaying a verified token skips signature verification."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        token = _make_token(key_pem)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            first = await verify_oidc_token(token, AUDIENCE, cache)
+            with patch("app.oidc.jwt.decode") as decode:
+                second = await verify_oidc_token(token, AUDIENCE, cache)
+                decode.assert_not_called()
+                # A different audience is verified from scratch
+                decode.side_effect = ValueError("Token has wrong audience")
+                assert await verify_oidc_token(token, "https://other.example.com", cache) is None
+
+        assert second == first
+
+    async def test_wrong_audience_rejected(self, key_pair):
+        """Tokens minted for another audience are rejected."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            token = _make_token(key_pem, aud="https://other.example.com")
+            assert await verify_oidc_token(token, AUDIENCE, cache) is None
+
+    async def test_wrong_issuer_rejected(self, key_pair):
+        """Tokens not issued by Google are rejected."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            token = _make_token(key_pem, iss="https://evil.example.com")
+            assert await verify_oidc_token(token, AUDIENCE, cache) is None
+
+    async def test_forged_signature_rejected(self, key_pair):
+        """Tokens signed by another key are rejected."""
+        _, cert_pem = key_pair
+        other_key_pem, _ = _make_key_pair()
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            assert await verify_oidc_token(_make_token(other_key_pem), AUDIENCE, cache) is None
+
+    async def test_malformed_token_rejected(self):
+        """Garbage that merely looks like a JWT is rejected."""
+        cache = GoogleCertCache(ttl=60)
+        assert await verify_oidc_token("eyJnotatoken", AUDIENCE, cache) is None
+
+    async def test_service_account_restriction(self, key_pair):
+        """Only the expected service account is accepted."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})), \
+                patch("app.oidc.settings.oidc_service_account_email", "other@example.com"):
+            assert await verify_oidc_token(_make_token(key_pem), AUDIENCE, cache) is None
+
+    async def test_unverified_email_rejected(self, key_pair):
+        """Tokens whose email is not verified are rejected."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})):
+            token = _make_token(key_pem, email_verified=False)
+            assert await verify_oidc_token(token, AUDIENCE, cache) is None
+
+    async def test_unconfigured_service_account_rejected(self, key_pair):
+        """Without a configured service account every token is rejected."""
+        key_pem, cert_pem = key_pair
+        cache = GoogleCertCache(ttl=60)
+        with patch.object(cache, "_fetch", new=AsyncMock(return_value={"kid-1": cert_pem})), \
+                patch("app.oidc.settings.oidc_service_account_email", ""):
+            assert await verify_oidc_token(_make_token(key_pem), AUDIENCE, cache) is None
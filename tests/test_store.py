@@ -0,0 +1,72 @@
+"""Tests for Firestore sync state storage."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models import TaskSyncState
+from app.store import FirestoreStore
+
+
+@pytest.mark.asyncio
+class TestFirestoreStoreBatchWrites:
+    """Test batched state writes."""
+
+    async def test_save_task_states_commits_batches_concurrently(self):
+        """States are split into small batches committed with bounded concurrency."""
+        client = MagicMock()
+        batches = []
+        in_flight = 0
+        peak = 0
+
+        async def commit():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        def make_batch():
+            batch = MagicMock()
+            batch.commit = AsyncMock(side_effect=commit)
+            batches.append(batch)
+            return batch
+
+        client.batch.side_effect = make_batch
+        store = FirestoreStore(project_id="test", namespace="test", client=client)
+        states = [
+            TaskSyncState(
+                todoist_task_id=f"task{i}", payload_hash="h", last_synced_at=datetime.now()
+            )
+            for i in range(1001)
+        ]
+
+        saved = await store.save_task_states(states)
+
+        assert saved == 1001
+        assert [batch.set.call_count for batch in batches] == [50] * 20 + [1]
+        assert all(batch.commit.await_count == 1 for batch in batches)
+        assert peak == 10
+        client.collection.assert_called_with("test_tasks")
+        client.collection.return_value.document.assert_any_call("task1000")
+
+    async def test_save_task_states_counts_only_committed_batches(self):
+        """A failed batch is skipped and left out of the committed count."""
+        client = MagicMock()
+        batch = MagicMock()
+        batch.commit = AsyncMock(side_effect=[RuntimeError("unavailable"), None])
+        client.batch.return_value = batch
+        store = FirestoreStore(project_id="test", namespace="test", client=client)
+        states = [
+            TaskSyncState(
+                todoist_task_id=f"task{i}", payload_hash="h", last_synced_at=datetime.now()
+            )
+            for i in range(60)
+        ]
+
+        saved = await store.save_task_states(states)
+
+        assert saved == 10
+        assert batch.commit.await_count == 2
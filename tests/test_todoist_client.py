@@ -25,6 +25,7 @@ def todoist_client():
         mock_settings.max_retries = 3
         mock_settings.retry_delay = 0.1
         mock_settings.request_timeout = 30
+        mock_settings.todoist_projects_cache_ttl = 30
 
         client = TodoistClient(
             api_token="test_token",
@@ -125,6 +126,24 @@ class TestTodoistClientTaskOperations:
             assert tasks[1].id == "2"
             assert mock_get.await_count == 2
 
+    async def test_get_tasks_limit_stops_pagination(
+        self, todoist_client, mock_todoist_api_response
+    ):
+        """Test that a limit requests smaller pages and stops once it is reached."""
+        page1 = _make_response(200, json_data={
+            "results": [{**mock_todoist_api_response, "id": str(i)} for i in range(3)],
+            "next_cursor": "cursor123",
+        })
+
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = page1
+
+            tasks = await todoist_client.get_tasks(limit=2)
+
+            assert [t.id for t in tasks] == ["0", "1"]
+            assert mock_get.await_count == 1
+            assert mock_get.call_args.kwargs["params"]["limit"] == 2
+
 
 @pytest.mark.asyncio
 class TestTodoistClientProjectOperations:
@@ -163,6 +182,26 @@ class TestTodoistClientProjectOperations:
             assert len(projects) == 2
             assert all(isinstance(p, TodoistProject) for p in projects)
 
+    async def test_get_projects_uses_ttl_cache(self, todoist_client):
+        """Test repeated get_projects calls within the TTL share one API call."""
+        mock_response = _make_response(200, json_data=[
+            {"id": "1", "name": "Project 1", "color": "red"},
+        ])
+
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = mock_response
+
+            first = await todoist_client.get_projects()
+            second = await todoist_client.get_projects()
+
+            assert mock_get.await_count == 1
+            assert [p.id for p in second] == [p.id for p in first]
+
+            # Clearing caches forces a refetch
+            todoist_client.clear_caches()
+            await todoist_client.get_projects()
+            assert mock_get.await_count == 2
+
 
 @pytest.mark.asyncio
 class TestTodoistClientCommentOperations:
@@ -4,6 +4,7 @@ import pytest
 from datetime import datetime, timezone
 
 from app.utils import (
+    PAYLOAD_HASH_VERSION,
     compute_payload_hash,
     get_current_timestamp,
     parse_iso_timestamp,
@@ -49,7 +50,9 @@ class TestComputePayloadHash:
         }
         hash_result = compute_payload_hash(data)
         assert isinstance(hash_result, str)
-        assert len(hash_result) == 64  # SHA-256 produces 64 hex chars
+        version, digest = hash_result.split(":")
+        assert version == PAYLOAD_HASH_VERSION
+        assert len(digest) == 32  # 128-bit BLAKE2b produces 32 hex chars
 
 
 class TestTimestampFunctions: